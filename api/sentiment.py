@@ -0,0 +1,61 @@
+"""
+Game review sentiment scoring route.
+"""
+import os
+import sys
+from dataclasses import dataclass
+from typing import List
+
+from scipy.special import expit
+
+from runtime import Args
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+if SRC_DIR not in sys.path:
+    sys.path.append(SRC_DIR)
+
+from predictor import Predictor  # noqa: E402
+from preprocess import TextCleaner  # noqa: E402
+
+predictor = Predictor.load()
+cleaner = TextCleaner()
+
+
+@dataclass
+class Input:
+    """
+    A game review to score.
+
+    :var review: The review text.
+    """
+    review: str
+
+
+@dataclass
+class Output:
+    """
+    The sentiment of a game review.
+
+    :var label: 1 for a positive review, 0 for a negative one.
+    :var probability: The probability that the review is positive.
+    """
+    label: int
+    probability: float
+
+
+def batch_handler(args_list: List[Args[Input]]) -> List[Output]:
+    """
+    Score a batch of game reviews with a single vectorized prediction.
+    """
+    reviews = [cleaner.clean(args.input.review) for args in args_list]
+    scores = predictor.decision_function(reviews)
+    labels = predictor.artifact.classes[(scores > 0).astype(int)]
+    return [Output(label=int(label), probability=float(probability))
+            for label, probability in zip(labels, expit(scores))]
+
+
+def handler(args: Args[Input]) -> Output:
+    """
+    Score the sentiment of a game review.
+    """
+    return batch_handler([args])[0]
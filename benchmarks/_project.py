@@ -0,0 +1,31 @@
+"""
+Throwaway runtime projects for the benchmarks.
+"""
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+
+
+@contextmanager
+def throwaway_project(manifest, files=None):
+    """
+    Write a project to a temporary directory, removed on exit.
+
+    Args:
+        manifest (dict): The content of ``manifest.json``.
+        files (dict, optional): The source of each file by its path relative to the project,
+            or a function of the project directory returning it.
+
+    Yields:
+        str: The project directory.
+    """
+    with tempfile.TemporaryDirectory() as project_dir:
+        with open(os.path.join(project_dir, 'manifest.json'), 'w', encoding='utf-8') as file:
+            json.dump(manifest, file)
+        for relative_path, source in (files or {}).items():
+            path = os.path.join(project_dir, relative_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(source(project_dir) if callable(source) else source)
+        yield project_dir
@@ -0,0 +1,99 @@
+"""
+Benchmark scoring with the on-disk feature cache against scoring without it.
+
+Builds ``--rows`` unique reviews by appending ``--words`` random words to
+the dataset's reviews, then scores them without the cache, with a cold cache, with a warm
+cache, and again after ``--changed`` of the reviews were edited. Every run
+must produce the same file as scoring without the cache. Finally a second
+vectorizer file is scored to check the cache discards the old entries.
+
+Usage:
+    python benchmarks/bench_feature_cache.py --rows 200000 --words 40 --changed 0.1
+"""
+import argparse
+import filecmp
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+
+import pandas as pd
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, SRC_DIR)
+
+from preprocess import load_dataset  # noqa: E402
+from scoring import VECTORIZER_PATH, score_csv  # noqa: E402
+
+WORDS = ('great', 'story', 'boring', 'graphics', 'combat', 'buggy', 'fun', 'music', 'grind', 'worth',
+         'price', 'multiplayer', 'crashes', 'beautiful', 'short', 'hours', 'recommend', 'refund')
+
+
+def build_input(path, rows, words, seed=0):
+    rng = random.Random(seed)
+    data = load_dataset()
+    data = pd.concat([data] * (rows // len(data) + 1), ignore_index=True).iloc[:rows].copy()
+    data['recentReviews'] = [f"{review} {' '.join(rng.choices(WORDS, k=words))} {i}"
+                             for i, review in enumerate(data['recentReviews'])]
+    data.to_csv(path, index=False)
+    return data
+
+
+def change_input(path, data, fraction, seed=1):
+    rng = random.Random(seed)
+    data = data.copy()
+    changed = rng.sample(range(len(data)), int(len(data) * fraction))
+    data.loc[changed, 'recentReviews'] = data.loc[changed, 'recentReviews'] + ' edited'
+    data.to_csv(path, index=False)
+
+
+def cached_rows(cache_path):
+    with sqlite3.connect(cache_path) as connection:
+        return connection.execute('SELECT COUNT(*) FROM features').fetchone()[0]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--chunksize', type=int, default=10000)
+    parser.add_argument('--words', type=int, default=40)
+    parser.add_argument('--changed', type=float, default=0.1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = os.path.join(tmp, 'input.csv')
+        changed_path = os.path.join(tmp, 'changed.csv')
+        cache_path = os.path.join(tmp, 'features.sqlite')
+        data = build_input(input_path, args.rows, args.words)
+        change_input(changed_path, data, args.changed)
+
+        def run(label, path, name, feature_cache_path=None, vectorizer_path=VECTORIZER_PATH, expected=None):
+            output_path = os.path.join(tmp, name)
+            stats = score_csv(path, output_path, args.chunksize, verbose=False, vectorizer_path=vectorizer_path,
+                              feature_cache_path=feature_cache_path)
+            if expected is not None:
+                assert filecmp.cmp(expected, output_path, shallow=False), f'{label} output differs'
+            print(f"{label:<24} {stats['seconds']:8.2f}s {stats['rows_per_sec']:10.0f} rows/s")
+            return output_path
+
+        baseline = run('no cache', input_path, 'baseline.csv')
+        run('cold cache', input_path, 'cold.csv', cache_path, expected=baseline)
+        run('warm cache', input_path, 'warm.csv', cache_path, expected=baseline)
+        changed_baseline = run(f'no cache, {args.changed:.0%} changed', changed_path, 'changed_baseline_output.csv')
+        run(f'warm cache, {args.changed:.0%} changed', changed_path, 'changed_output.csv', cache_path,
+            expected=changed_baseline)
+        print(f'cached rows {cached_rows(cache_path)}, cache file {os.path.getsize(cache_path) / 2 ** 20:.1f} MiB')
+
+        # Same fitted state, another file: entries of the old fingerprint must go
+        vectorizer_copy = os.path.join(tmp, 'vectorizer.pkl')
+        shutil.copyfile(VECTORIZER_PATH, vectorizer_copy)
+        with open(vectorizer_copy, 'ab') as file:
+            file.write(b'\x00')
+        run('new vectorizer file', input_path, 'refit.csv', cache_path, vectorizer_copy, expected=baseline)
+        assert cached_rows(cache_path) == args.rows, 'entries of the old vectorizer were kept'
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Compare the fitted TfidfVectorizer with HashingTfidfVectorizer.
+
+Reports test accuracy of the trained model, then transform throughput,
+artifact size and artifact load time of both vectorizers fitted on the game
+descriptions.
+
+Usage:
+    python benchmarks/bench_hashing_vectorizer.py --rows 200000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import joblib
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import train_test_split
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, SRC_DIR)
+
+from hashing import HashingTfidfVectorizer  # noqa: E402
+from preprocess import TextCleaner, clean, load_dataset  # noqa: E402
+
+# Same binary labels as model.py
+LABELS = {2.0: 1, 1.0: 1, 0.0: 0, -1.0: 0}
+
+
+def best_of(func, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=100000, help='Documents used for the transform timing.')
+    args = parser.parse_args()
+
+    df = clean(load_dataset())
+    df['label'] = df['sentiment'].astype(float).map(LABELS)
+    df = df.dropna(subset=['label'])
+    X_train, X_test, y_train, y_test = train_test_split(
+        df['cleaned_review'], df['label'], test_size=0.2, random_state=42)
+
+    descriptions = TextCleaner().clean_series(load_dataset(columns=['description', 'recentReviews'])['description'])
+    corpus = pd.concat([descriptions] * (args.rows // len(descriptions) + 1), ignore_index=True).iloc[:args.rows]
+
+    pipelines = {
+        'tfidf': (TfidfVectorizer(max_features=5000), 'vectorizer.pkl',
+                  lambda vec, path: joblib.dump(vec, path), joblib.load),
+        'hashing': (HashingTfidfVectorizer(), 'hashing_idf.npy',
+                    lambda vec, path: vec.save(path), HashingTfidfVectorizer.load),
+    }
+
+    print(f"{'features':<10} {'accuracy':>9} {'transform docs/s':>17} {'artifact KB':>12} {'load ms':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, (vectorizer, filename, save, load) in pipelines.items():
+            model = LogisticRegression().fit(vectorizer.fit_transform(X_train), y_train)
+            accuracy = accuracy_score(y_test, model.predict(vectorizer.transform(X_test)))
+
+            # Refit on the descriptions for a realistically sized vocabulary
+            vectorizer.fit(corpus)
+            seconds = best_of(lambda: vectorizer.transform(corpus), repeat=3)
+
+            path = os.path.join(tmp, filename)
+            save(vectorizer, path)
+            size_kb = os.path.getsize(path) / 1024
+            load_ms = best_of(lambda: load(path)) * 1000
+
+            print(f'{name:<10} {accuracy:9.3f} {len(corpus) / seconds:17.0f} {size_kb:12.1f} {load_ms:9.2f}')
+
+
+if __name__ == '__main__':
+    main()
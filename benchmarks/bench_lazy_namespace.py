@@ -0,0 +1,100 @@
+"""
+Compare eager ``dict_to_namespace`` with ``lazy_namespace`` on large nested inputs.
+
+A batch input carries ``--reviews`` reviews, each with nested author and
+game objects and a list of tags. For each access pattern a handler might
+have, the script reports the time and the peak memory allocated (tracemalloc)
+to convert the decoded input and run the access. It first checks that list
+operations on the lazy input give the same results as on the eager one.
+
+Usage:
+    python benchmarks/bench_lazy_namespace.py --reviews 5000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from runtime.core._utils import dict_to_namespace, lazy_namespace  # noqa: E402
+
+ACCESS = {
+    'count reviews': lambda input: len(input.reviews),
+    'first review': lambda input: input.reviews[0].text,
+    'one field each': lambda input: sum(len(review.text) for review in input.reviews),
+    'every field': lambda input: sum(len(review.text) + len(review.author.name) + review.game.id
+                                     + len(review.game.tags) for review in input.reviews),
+}
+
+
+# List operations a handler may use, each must give the same result on eager and lazy input
+LIST_OPERATIONS = {
+    'reversed': lambda items: [item.a for item in reversed(items)],
+    'pop': lambda items: [items.pop().a, items.pop(0).a, [item.a for item in items]],
+    'copy': lambda items: [item.a for item in items.copy()],
+    'add': lambda items: [item.a for item in items + items],
+    'radd': lambda items: [item.a for item in [] + items],
+    'multiply': lambda items: [item.a for item in items * 2],
+    'sort': lambda items: (items.sort(key=lambda item: -item.a), [item.a for item in items])[1],
+    'index': lambda items: items.index(items[2]),
+    'contains': lambda items: [items[1] in items, {'a': 1} in items],
+    'count': lambda items: items.count(items[0]),
+    'remove': lambda items: (items.remove(items[1]), [item.a for item in items])[1],
+    'nested': lambda items: [tag for item in reversed(items) for tag in reversed(item.tags)],
+}
+
+
+def check_list_operations():
+    payload = json.dumps([{'a': i, 'tags': [f't{i}', f'u{i}']} for i in range(5)])
+    for name, operation in LIST_OPERATIONS.items():
+        eager = operation(dict_to_namespace(json.loads(payload)))
+        lazy = operation(lazy_namespace(json.loads(payload)))
+        assert eager == lazy, f'{name}: {eager!r} != {lazy!r}'
+
+
+def make_payload(reviews):
+    return json.dumps({'batch_id': 'bench', 'reviews': [{
+        'text': f'Review number {i}, a great game with a great story',
+        'author': {'name': f'player{i}', 'hours': i % 300, 'profile': {'country': 'NZ', 'level': i % 50}},
+        'game': {'id': i % 97, 'title': 'Half-Life', 'tags': ['FPS', 'Classic', 'Singleplayer']},
+    } for i in range(reviews)]})
+
+
+def measure(convert, access, payload, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        decoded = json.loads(payload)
+        start = time.perf_counter()
+        access(convert(decoded))
+        best = min(best, time.perf_counter() - start)
+
+    decoded = json.loads(payload)
+    tracemalloc.start()
+    access(convert(decoded))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--reviews', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    check_list_operations()
+    payload = make_payload(args.reviews)
+
+    print(f"{'access':<16} {'eager ms':>9} {'lazy ms':>8} {'eager MB':>9} {'lazy MB':>8}")
+    for name, access in ACCESS.items():
+        eager_time, eager_bytes = measure(dict_to_namespace, access, payload, args.repeat)
+        lazy_time, lazy_bytes = measure(lazy_namespace, access, payload, args.repeat)
+        print(f'{name:<16} {eager_time * 1000:9.2f} {lazy_time * 1000:8.2f} '
+              f'{eager_bytes / 2 ** 20:9.2f} {lazy_bytes / 2 ** 20:8.2f}')
+
+
+if __name__ == '__main__':
+    main()
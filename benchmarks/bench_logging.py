@@ -0,0 +1,74 @@
+"""
+Measure what logging costs a request on the calling thread.
+
+Invokes ``App.entry_handler`` directly, without HTTP, on a throwaway project
+whose handler writes ``--lines`` user log lines per request, with a request
+id and runtime event header. The app logs synchronously, then through the
+log queue. Log output goes to ``--log-file``, /dev/null by default, so the
+terminal does not slow down the writes; the records dropped by a full queue
+are reported too. Point ``--log-file`` at a FIFO drained by a slow reader to
+see a log collector that can't keep up stall synchronous requests.
+
+Usage:
+    python benchmarks/bench_logging.py --requests 20000 --lines 3
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import runtime.core as runtime  # noqa: E402
+from runtime.core import _logger  # noqa: E402
+from _project import throwaway_project  # noqa: E402
+
+MANIFEST = {'api': [{'route': '/logging', 'file': 'api/logging.py'}]}
+HANDLER = '''INPUT_AS_DICT = True
+
+
+def handler(args):
+    for line in range({lines}):
+        args.logger.info('scored review %s, line %d', args.input['review'], line)
+    return {{'label': 1, 'probability': 0.9685798658213737}}
+'''
+BODY = json.dumps({'input': {'review': 'Very Positive'}})
+HEADERS = {'x-bizide-request-id': 'bench', 'x-runtime-event': json.dumps({'biz_function_id': 'bench'})}
+
+
+def measure(project_dir, log_queue_size, requests):
+    app = runtime.App(project_dir, log_queue_size=log_queue_size)
+    app.init_project()
+    request = runtime.InvokeRequest(version=1, protocol='HTTP', method='POST', url='/logging',
+                                    headers=HEADERS, body=BODY, is_base64_encoded=False)
+    app.entry_handler(request)
+    dropped = _logger.get_dropped_logs()
+    start = time.perf_counter()
+    for _ in range(requests):
+        app.entry_handler(request)
+    elapsed = time.perf_counter() - start
+    return elapsed / requests, _logger.get_dropped_logs() - dropped
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--lines', type=int, default=3)
+    parser.add_argument('--log-file', default=os.devnull)
+    args = parser.parse_args()
+
+    # The log handlers write to stderr, point it at the log file and keep the report on stdout
+    log_file = os.open(args.log_file, os.O_WRONLY | os.O_CREAT | os.O_APPEND)
+    os.dup2(log_file, sys.stderr.fileno())
+
+    with throwaway_project(MANIFEST, {'api/logging.py': HANDLER.format(lines=args.lines)}) as project_dir:
+        print(f"{'logging':<22} {'us/request':>11} {'dropped':>8}")
+        for label, log_queue_size in (('synchronous', None), ('queue of 10000', 10000), ('queue of 100', 100)):
+            seconds, dropped = measure(project_dir, log_queue_size, args.requests)
+            print(f'{label:<22} {seconds * 1e6:11.1f} {dropped:8d}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Measure what recording the per-route metrics costs a request.
+
+Times ``_metrics.record`` on its own, from one thread and from
+``--threads`` threads at once, then times ``App.entry_handler`` on a
+throwaway project with a trivial handler with recording enabled and with
+it replaced by a no-op. Finally renders the metrics once.
+
+Usage:
+    python benchmarks/bench_metrics.py --requests 20000 --threads 8
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import runtime.core as runtime  # noqa: E402
+from runtime.core import _metrics  # noqa: E402
+from _project import throwaway_project  # noqa: E402
+
+MANIFEST = {'api': [{'route': '/trivial', 'file': 'api/trivial.py'}]}
+HANDLER = '''INPUT_AS_DICT = True
+
+
+def handler(args):
+    return {'label': 1, 'probability': 0.9685798658213737}
+'''
+BODY = json.dumps({'input': {'review': 'Very Positive'}})
+DURATIONS = {'fn-run': 180_000, 'fn-total': 240_000}
+
+
+def time_records(metrics, records):
+    start = time.perf_counter()
+    for _ in range(records):
+        metrics.record('trivial', DURATIONS)
+    return time.perf_counter() - start
+
+
+def time_threaded_records(metrics, records, threads):
+    barrier = threading.Barrier(threads + 1)
+
+    def worker():
+        barrier.wait()
+        time_records(metrics, records)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def time_requests(app, requests):
+    request = runtime.InvokeRequest(version=1, protocol='HTTP', method='POST', url='/trivial',
+                                    headers={}, body=BODY, is_base64_encoded=False)
+    app.entry_handler(request)
+    start = time.perf_counter()
+    for _ in range(requests):
+        app.entry_handler(request)
+    return (time.perf_counter() - start) / requests
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--threads', type=int, default=8)
+    args = parser.parse_args()
+
+    metrics = _metrics.Metrics()
+    seconds = time_records(metrics, args.requests)
+    print(f'record, 1 thread           {seconds / args.requests * 1e6:8.2f} us/record')
+    seconds = time_threaded_records(metrics, args.requests, args.threads)
+    print(f'record, {args.threads:<2} threads          {seconds / (args.requests * args.threads) * 1e6:8.2f} us/record')
+
+    with throwaway_project(MANIFEST, {'api/trivial.py': HANDLER}) as project_dir:
+        app = runtime.App(project_dir)
+        app.init_project()
+        # Request logging would dominate the measurement
+        logging.disable(logging.INFO)
+
+        record = _metrics.record
+        _metrics.record = lambda route, durations, error_code=None: None
+        without = min(time_requests(app, args.requests) for _ in range(3))
+        _metrics.record = record
+        with_metrics = min(time_requests(app, args.requests) for _ in range(3))
+        print(f'request without metrics    {without * 1e6:8.2f} us')
+        print(f'request with metrics       {with_metrics * 1e6:8.2f} us')
+
+        start = time.perf_counter()
+        document = app.metrics()
+        print(f'render                     {(time.perf_counter() - start) * 1e3:8.2f} ms, '
+              f'{len(document.splitlines())} lines')
+
+
+if __name__ == '__main__':
+    main()
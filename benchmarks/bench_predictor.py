@@ -0,0 +1,85 @@
+"""
+Compare the scikit-learn serving path with the pure NumPy ``Predictor``.
+
+Reports cold import-and-load time and resident memory of a fresh interpreter,
+single review latency and batch throughput, and checks that predictions and
+probabilities are bit-for-bit identical.
+
+Usage:
+    python benchmarks/bench_predictor.py --reviews 2000
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+import warnings
+
+import joblib
+import numpy as np
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, SRC_DIR)
+
+from predictor import Predictor  # noqa: E402
+from preprocess import TextCleaner, load_dataset  # noqa: E402
+
+COLD_START = {
+    'sklearn': "import joblib; joblib.load('model.pkl'); joblib.load('vectorizer.pkl')",
+    'numpy': 'from predictor import Predictor; Predictor.load()',
+}
+# Resident memory is read from /proc: ru_maxrss would include this parent's peak, inherited across fork
+MEASURE = ('import time, warnings; warnings.simplefilter("ignore"); start = time.perf_counter(); {}; '
+           'elapsed = time.perf_counter() - start; '
+           'rss = [line.split()[1] for line in open("/proc/self/status") if line.startswith("VmRSS")][0]; '
+           'print(elapsed, rss)')
+
+
+def cold_start(code, repeat=5):
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.check_output([sys.executable, '-c', MEASURE.format(code)], cwd=SRC_DIR, text=True)
+        seconds, rss_kb = out.split()
+        runs.append((float(seconds), int(rss_kb)))
+    return min(runs)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--reviews', type=int, default=2000)
+    args = parser.parse_args()
+    warnings.simplefilter('ignore')
+
+    model = joblib.load(os.path.join(SRC_DIR, 'model.pkl'))
+    vectorizer = joblib.load(os.path.join(SRC_DIR, 'vectorizer.pkl'))
+    predictor = Predictor.load()
+
+    reviews = TextCleaner().clean_series(load_dataset()['recentReviews']).tolist()
+    reviews = (reviews * (args.reviews // len(reviews) + 1))[:args.reviews]
+
+    expected = model.predict_proba(vectorizer.transform(reviews))
+    assert np.array_equal(predictor.predict_proba(reviews), expected), 'probabilities differ'
+    assert np.array_equal(predictor.predict(reviews), model.predict(vectorizer.transform(reviews))), 'predictions differ'
+
+    paths = {
+        'sklearn': lambda docs: model.predict_proba(vectorizer.transform(docs)),
+        'numpy': predictor.predict_proba,
+    }
+    print(f"{'path':<8} {'import+load ms':>15} {'rss MB':>11} {'per review us':>14} {'batch reviews/s':>16}")
+    for name, score in paths.items():
+        seconds, rss_kb = cold_start(COLD_START[name])
+
+        start = time.perf_counter()
+        for review in reviews:
+            score([review])
+        single = (time.perf_counter() - start) / len(reviews)
+
+        start = time.perf_counter()
+        score(reviews)
+        batch = len(reviews) / (time.perf_counter() - start)
+
+        print(f'{name:<8} {seconds * 1000:15.1f} {rss_kb / 1024:11.1f} {single * 1e6:14.1f} {batch:16.0f}')
+
+
+if __name__ == '__main__':
+    main()
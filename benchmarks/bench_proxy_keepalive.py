@@ -0,0 +1,141 @@
+"""
+Measure the requests per second of the proxy with and without keep-alive.
+
+Starts ``runtime/cli dev`` with a thread pool on a throwaway project whose
+route returns a sentiment-sized result without doing any work, so the
+transport dominates. ``--concurrency`` client threads then send requests
+for ``--duration`` seconds over raw sockets, first opening a connection per
+request (``Connection: close``), then keeping one connection per thread
+alive. Logging is synchronous and goes to /dev/null.
+
+Usage:
+    python benchmarks/bench_proxy_keepalive.py --concurrency 8 --duration 5
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+from _project import throwaway_project
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MANIFEST = {'api': [{'route': '/trivial', 'file': 'api/trivial.py'}]}
+HANDLER = '''INPUT_AS_DICT = True
+
+
+def handler(args):
+    return {'label': 1, 'probability': 0.9685798658213737}
+'''
+BODY = json.dumps({'input': {'review': 'Very Positive'}}).encode('utf-8')
+
+
+def build_request(keep_alive):
+    connection = b'keep-alive' if keep_alive else b'close'
+    return (b'POST /trivial HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n'
+            b'Connection: ' + connection + b'\r\nContent-Length: ' + str(len(BODY)).encode() + b'\r\n\r\n' + BODY)
+
+
+def read_response(sock, pending):
+    """
+    Reads one response, returning its status and the bytes received past it.
+    """
+    while b'\r\n\r\n' not in pending:
+        chunk = sock.recv(65536)
+        if not chunk:
+            raise ConnectionError('connection closed')
+        pending += chunk
+    head, _, rest = pending.partition(b'\r\n\r\n')
+    status = int(head.split(b' ', 2)[1])
+    length = 0
+    for line in head.split(b'\r\n')[1:]:
+        name, _, value = line.partition(b':')
+        if name.strip().lower() == b'content-length':
+            length = int(value)
+    while len(rest) < length:
+        chunk = sock.recv(65536)
+        if not chunk:
+            raise ConnectionError('connection closed')
+        rest += chunk
+    return status, rest[length:]
+
+
+def load(port, keep_alive, concurrency, duration):
+    request = build_request(keep_alive)
+    counts, errors = [0] * concurrency, [0] * concurrency
+    deadline = time.monotonic() + duration
+
+    def client(index):
+        sock, pending = None, b''
+        while time.monotonic() < deadline:
+            try:
+                if sock is None:
+                    sock = socket.create_connection(('127.0.0.1', port))
+                    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                sock.sendall(request)
+                status, pending = read_response(sock, pending)
+                if status == 200:
+                    counts[index] += 1
+                else:
+                    errors[index] += 1
+            except OSError:
+                errors[index] += 1
+                sock.close()
+                sock, pending = None, b''
+                continue
+            if not keep_alive:
+                sock.close()
+                sock, pending = None, b''
+        if sock is not None:
+            sock.close()
+
+    clients = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    start = time.monotonic()
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+    return sum(counts) / (time.monotonic() - start), sum(errors)
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f'server did not start on port {port}')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=5)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--port', type=int, default=3099)
+    args = parser.parse_args()
+
+    with throwaway_project(MANIFEST, {'api/trivial.py': HANDLER}) as project_dir:
+        command = [sys.executable, os.path.join(ROOT_DIR, 'runtime', 'cli'), 'dev', f':{args.port}',
+                   '--root', project_dir, '--threads', str(args.threads)]
+        with open(os.devnull, 'w') as devnull:
+            server = subprocess.Popen(command, stdout=devnull, stderr=devnull)
+        try:
+            wait_for_port(args.port)
+            print(f"{'connections':<22} {'req/s':>9} {'errors':>7}")
+            for label, keep_alive in (('one per request', False), ('kept alive', True)):
+                rate, errors = load(args.port, keep_alive, args.concurrency, args.duration)
+                print(f'{label:<22} {rate:9.1f} {errors:7d}')
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
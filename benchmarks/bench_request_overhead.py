@@ -0,0 +1,79 @@
+"""
+Measure the runtime's per-request overhead around a trivial handler.
+
+Invokes ``App.entry_handler`` directly, without HTTP, on a throwaway project
+with two routes returning a sentiment-sized result: one taking the input as
+namespaces and one opting in to plain dicts with ``INPUT_AS_DICT = True``.
+Each route is timed with the standard library codec and, when installed,
+with orjson.
+
+Usage:
+    python benchmarks/bench_request_overhead.py --requests 20000
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import runtime.core as runtime  # noqa: E402
+from runtime.core import _codec  # noqa: E402
+from _project import throwaway_project  # noqa: E402
+
+MANIFEST = {'api': [{'route': '/namespace', 'file': 'api/namespace.py'},
+                    {'route': '/dict', 'file': 'api/dict.py'}]}
+NAMESPACE_HANDLER = '''def handler(args):
+    return {'label': int(len(args.input.review) > 10), 'probability': 0.9685798658213737}
+'''
+DICT_HANDLER = '''INPUT_AS_DICT = True
+
+
+def handler(args):
+    return {'label': int(len(args.input['review']) > 10), 'probability': 0.9685798658213737}
+'''
+BODY = json.dumps({'input': {'review': 'Very Positive', 'game': {'title': 'Half-Life', 'tags': ['FPS', 'Classic']}}})
+HEADERS = {'x-bizide-request-id': 'bench', 'x-runtime-event': json.dumps({'biz_function_id': 'bench'})}
+
+
+def measure(app, route, requests):
+    request = runtime.InvokeRequest(version=1, protocol='HTTP', method='POST', url=route,
+                                    headers=HEADERS, body=BODY, is_base64_encoded=False)
+    app.entry_handler(request)
+    start = time.perf_counter()
+    for _ in range(requests):
+        response = app.entry_handler(request)
+    elapsed = time.perf_counter() - start
+    assert 'data' in json.loads(response.body), response.body
+    return elapsed / requests
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=20000)
+    args = parser.parse_args()
+
+    codecs = [_codec.JsonCodec()]
+    if _codec.orjson is not None:
+        codecs.append(_codec.OrjsonCodec())
+
+    files = {'api/namespace.py': NAMESPACE_HANDLER, 'api/dict.py': DICT_HANDLER}
+    with throwaway_project(MANIFEST, files) as project_dir:
+        app = runtime.App(project_dir)
+        app.init_project()
+        # Request logging would dominate the measurement
+        logging.disable(logging.INFO)
+
+        print(f"{'codec':<8} {'input':<10} {'us/request':>11}")
+        for codec in codecs:
+            _codec.set_codec(codec)
+            for route in ('/namespace', '/dict'):
+                seconds = measure(app, route, args.requests)
+                print(f'{codec.name:<8} {route[1:]:<10} {seconds * 1e6:11.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Measure the response cache on the sentiment route with repeated reviews.
+
+Serves ``api/sentiment.py`` from a throwaway manifest twice, without and
+with ``"cache": true``, and invokes both through ``App.entry_handler`` with
+reviews drawn from ``--distinct`` texts by a Zipf-like distribution, as
+short reviews like "good game" repeat in real traffic. Reports the time
+per request and the hit rate.
+
+Usage:
+    python benchmarks/bench_response_cache.py --requests 5000 --distinct 500
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import runtime.core as runtime  # noqa: E402
+from _project import throwaway_project  # noqa: E402
+
+HANDLER_FILE = os.path.join(ROOT_DIR, 'api', 'sentiment.py')
+MANIFEST = {'api': [{'route': '/plain', 'file': HANDLER_FILE},
+                    {'route': '/cached', 'file': HANDLER_FILE, 'cache': True}]}
+WORDS = ['good', 'game', 'great', 'fun', 'boring', 'bad', 'story', 'graphics', 'buggy', 'love', 'hate',
+         'worth', 'money', 'multiplayer', 'classic', 'short', 'long', 'hard', 'easy', 'music']
+
+
+def build_requests(requests, distinct, seed=0):
+    rng = random.Random(seed)
+    texts = [' '.join(rng.choice(WORDS) for _ in range(rng.randint(2, 12))) for _ in range(distinct)]
+    weights = [1 / (rank + 1) for rank in range(distinct)]
+    return [json.dumps({'input': {'review': review}}) for review in rng.choices(texts, weights, k=requests)]
+
+
+def measure(app, route, bodies):
+    start = time.perf_counter()
+    hits = 0
+    for body in bodies:
+        response = app.entry_handler(runtime.InvokeRequest(version=1, protocol='HTTP', method='POST', url=route,
+                                                           headers={}, body=body, is_base64_encoded=False))
+        hits += (response.headers.get('x-runtime-cache') or '').startswith('hit')
+    return (time.perf_counter() - start) / len(bodies), hits / len(bodies)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--distinct', type=int, default=500)
+    args = parser.parse_args()
+
+    with throwaway_project(MANIFEST) as project_dir:
+        app = runtime.App(project_dir, preload=True)
+        app.init_project()
+        # Request logging would dominate the measurement
+        logging.disable(logging.INFO)
+
+        bodies = build_requests(args.requests, args.distinct)
+        print(f"{'route':<8} {'us/request':>11} {'hit rate':>9}")
+        for route in ('/plain', '/cached'):
+            seconds, hit_rate = measure(app, route, bodies)
+            print(f'{route[1:]:<8} {seconds * 1e6:11.1f} {hit_rate:9.1%}')
+
+
+if __name__ == '__main__':
+    main()
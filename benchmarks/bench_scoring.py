@@ -0,0 +1,54 @@
+"""
+Benchmark streaming scoring throughput for increasing worker counts.
+
+Every run must produce the same file as the serial run.
+
+Usage:
+    python benchmarks/bench_scoring.py --rows 500000 --workers 1 2 4 8
+"""
+import argparse
+import filecmp
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, SRC_DIR)
+
+from preprocess import load_dataset  # noqa: E402
+from scoring import score_csv  # noqa: E402
+
+
+def build_input(path, rows):
+    data = load_dataset()
+    repeats = rows // len(data) + 1
+    pd.concat([data] * repeats, ignore_index=True).iloc[:rows].to_csv(path, index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--chunksize', type=int, default=10000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = os.path.join(tmp, 'input.csv')
+        build_input(input_path, args.rows)
+
+        baseline_path, baseline = None, None
+        for workers in args.workers:
+            output_path = os.path.join(tmp, f'output_{workers}.csv')
+            stats = score_csv(input_path, output_path, args.chunksize, workers=workers, verbose=False)
+            if baseline_path is None:
+                baseline_path, baseline = output_path, stats['rows_per_sec']
+            assert filecmp.cmp(baseline_path, output_path, shallow=False), \
+                f'{workers} workers output differs from {args.workers[0]} worker(s)'
+            print(f"workers={workers:<3} {stats['seconds']:8.2f}s {stats['rows_per_sec']:10.0f} rows/s "
+                  f"scaling {stats['rows_per_sec'] / baseline:5.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark the per-row ``clean_text`` against ``TextCleaner.clean_series``.
+
+Usage:
+    python benchmarks/bench_text_cleaner.py --rows 50000 --workers 4
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+import pandas as pd
+from nltk.corpus import stopwords
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, SRC_DIR)
+
+from preprocess import TextCleaner, load_dataset  # noqa: E402
+
+
+def legacy_clean_text(text):
+    # The original per-row implementation, kept here as the reference.
+    if not isinstance(text, str):
+        return ''
+    text = re.sub(r'[^\w\s]', '', text)
+    text = text.lower()
+    stop_words = set(stopwords.words('english'))
+    text = ' '.join([word for word in text.split() if word not in stop_words])
+    return text
+
+
+def build_series(rows):
+    data = load_dataset(columns=['description', 'recentReviews'])
+    values = pd.concat([data['description'], data['recentReviews']], ignore_index=True)
+    repeats = rows // len(values) + 1
+    return pd.concat([values] * repeats, ignore_index=True).iloc[:rows]
+
+
+def timed(label, rows, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f'{label:<28} {elapsed:8.3f}s {rows / elapsed:12.0f} rows/s')
+    return result, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--chunksize', type=int, default=10000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    series = build_series(args.rows)
+    cleaner = TextCleaner()
+
+    expected, legacy = timed('legacy apply(clean_text)', args.rows,
+                             lambda: series.apply(legacy_clean_text))
+    batched, serial = timed('TextCleaner serial', args.rows,
+                            lambda: cleaner.clean_series(series, args.chunksize))
+    pooled, parallel = timed(f'TextCleaner {args.workers} workers', args.rows,
+                             lambda: cleaner.clean_series(series, args.chunksize, args.workers))
+
+    assert batched.equals(expected), 'serial output differs from clean_text'
+    assert pooled.equals(expected), 'parallel output differs from clean_text'
+    print(f'speedup: serial {legacy / serial:.1f}x, parallel {legacy / parallel:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+"""
+Load test the runtime dev server with and without the request thread pool.
+
+A throwaway project with a single route that sleeps for ``--handler-ms`` is
+served by ``runtime/cli dev``, once handling one request at a time and once
+with ``--threads``. Each run is driven by ``--concurrency`` client threads.
+A last run keeps every client's connection alive while ``--idle`` more
+connections sit idle after one request, and fails if any request waited as
+long as the keep-alive timeout, which an idle connection holding a pool
+thread would make it do.
+
+Usage:
+    python benchmarks/load_test_proxy.py --threads 16 --concurrency 32 --idle 16 --requests 2000
+"""
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLI = os.path.join(ROOT_DIR, 'runtime', 'cli')
+sys.path.insert(0, ROOT_DIR)
+
+from _project import throwaway_project  # noqa: E402
+from runtime.proxy.proxy import KEEP_ALIVE_TIMEOUT_SECONDS  # noqa: E402
+
+MANIFEST = {'api': [{'route': '/sleep', 'file': 'api/sleep.py'}]}
+HANDLER = '''import time
+
+
+def handler(args):
+    time.sleep(args.input.ms / 1000)
+    return {'ok': True}
+'''
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(project_dir, port, threads, queue_size):
+    command = [sys.executable, CLI, 'dev', f'127.0.0.1:{port}', '--root', project_dir]
+    if threads:
+        command += ['--threads', str(threads), '--queue-size', str(queue_size)]
+    server = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+            return server
+        except OSError:
+            time.sleep(0.05)
+    server.kill()
+    raise RuntimeError('server did not start')
+
+
+def drive(port, requests, concurrency, handler_ms, keep_alive=False):
+    body = json.dumps({'input': {'ms': handler_ms}})
+    latencies, statuses, lock = [], {}, threading.Lock()
+    remaining = iter(range(requests))
+
+    def client():
+        conn = None
+        for _ in remaining:
+            start = time.perf_counter()
+            try:
+                if conn is None:
+                    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+                conn.request('POST', '/sleep', body=body, headers={'Content-Type': 'application/json'})
+                response = conn.getresponse()
+                response.read()
+                status = response.status
+                if not keep_alive or response.will_close:
+                    conn.close()
+                    conn = None
+            except (OSError, http.client.HTTPException):
+                status = 'error'
+                conn.close()
+                conn = None
+            with lock:
+                latencies.append(time.perf_counter() - start)
+                statuses[status] = statuses.get(status, 0) + 1
+        if conn is not None:
+            conn.close()
+
+    start = time.perf_counter()
+    clients = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+    return time.perf_counter() - start, sorted(latencies), statuses
+
+
+def open_idle_connections(port, count):
+    """
+    Opens connections that send one request and then stay idle.
+    """
+    connections = []
+    for _ in range(count):
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        conn.request('POST', '/sleep', body=json.dumps({'input': {'ms': 0}}),
+                     headers={'Content-Type': 'application/json'})
+        conn.getresponse().read()
+        connections.append(conn)
+    return connections
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--queue-size', type=int, default=64)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--handler-ms', type=float, default=10)
+    parser.add_argument('--idle', type=int, default=16, help='Idle connections held open in the keep-alive run.')
+    args = parser.parse_args()
+
+    runs = (('single', None, False, 0),
+            (f'threads={args.threads}', args.threads, False, 0),
+            ('keep-alive', args.threads, True, args.idle))
+    with throwaway_project(MANIFEST, {'api/sleep.py': HANDLER}) as project_dir:
+        print(f"{'mode':<12} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}  statuses")
+        for label, threads, keep_alive, idle in runs:
+            port = free_port()
+            server = start_server(project_dir, port, threads, args.queue_size)
+            try:
+                idle_connections = open_idle_connections(port, idle)
+                elapsed, latencies, statuses = drive(port, args.requests, args.concurrency, args.handler_ms,
+                                                     keep_alive)
+                for conn in idle_connections:
+                    conn.close()
+            finally:
+                server.terminate()
+                server.wait()
+            p50 = latencies[len(latencies) // 2] * 1000
+            p99 = latencies[int(len(latencies) * 0.99)] * 1000
+            print(f'{label:<12} {args.requests / elapsed:9.1f} {p50:8.1f} {p99:8.1f} {latencies[-1] * 1000:8.1f}  '
+                  f'{statuses}')
+            if keep_alive:
+                assert latencies[-1] < KEEP_ALIVE_TIMEOUT_SECONDS, \
+                    f'a request waited {latencies[-1]:.2f}s, as long as the keep-alive timeout'
+
+
+if __name__ == '__main__':
+    main()
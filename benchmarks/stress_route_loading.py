@@ -0,0 +1,129 @@
+"""
+Stress the lazy route loader with many simultaneous first requests.
+
+A throwaway project has a slow-importing route, whose module appends a line
+to a log file every time it executes, and a route whose import always fails.
+``--concurrency`` threads, then as many asyncio tasks, invoke both routes at
+once through the runtime ``App``. The script checks that the good module
+executed exactly once and served every request, and that the failing module
+was imported once, its cached error being returned to every other caller.
+
+Usage:
+    python benchmarks/stress_route_loading.py --concurrency 64 --rounds 5
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import runtime.core as runtime  # noqa: E402
+from _project import throwaway_project  # noqa: E402
+
+MANIFEST = {'api': [{'route': '/slow', 'file': 'api/slow.py'},
+                    {'route': '/broken', 'file': 'api/broken.py'}]}
+SLOW_HANDLER = '''import time
+
+with open({log!r}, 'a') as log:
+    log.write('slow\\n')
+time.sleep(0.2)
+
+
+def handler(args):
+    return args.input.n
+'''
+BROKEN_HANDLER = '''with open({log!r}, 'a') as log:
+    log.write('broken\\n')
+raise ImportError('broken on purpose')
+'''
+
+
+def invoke_request(route, n):
+    return runtime.InvokeRequest(version=1, protocol='HTTP', method='POST', url=route, headers={},
+                                 body=json.dumps({'input': {'n': n}}), is_base64_encoded=False)
+
+
+def executions(log_path, name):
+    with open(log_path, encoding='utf-8') as log:
+        return sum(1 for line in log if line.strip() == name)
+
+
+def check(label, log_path, responses, concurrency):
+    slow = [json.loads(response.body) for route, response in responses if route == '/slow']
+    broken = [json.loads(response.body) for route, response in responses if route == '/broken']
+    served = sum(1 for body in slow if 'data' in body)
+    failed = sum(1 for body in broken if body.get('code') == 'ERR_FUNCTION_NOT_FOUND')
+    slow_runs, broken_runs = executions(log_path, 'slow'), executions(log_path, 'broken')
+    print(f'{label:<8} requests={len(responses):<5} served={served:<4} cached errors={failed:<4} '
+          f'slow module executed={slow_runs} broken module executed={broken_runs}')
+    assert served == concurrency, 'some requests to the slow route failed'
+    assert failed == concurrency, 'some requests to the broken route did not fail'
+    assert slow_runs == 1, f'slow module executed {slow_runs} times'
+    assert broken_runs == 1, f'broken module executed {broken_runs} times'
+
+
+def stress_threads(app, concurrency):
+    barrier = threading.Barrier(concurrency * 2)
+    responses, lock = [], threading.Lock()
+
+    def client(route, n):
+        barrier.wait()
+        response = app.entry_handler(invoke_request(route, n))
+        with lock:
+            responses.append((route, response))
+
+    clients = [threading.Thread(target=client, args=(route, n))
+               for n in range(concurrency) for route in ('/slow', '/broken')]
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+    return responses
+
+
+async def stress_tasks(app, concurrency):
+    requests = [(route, n) for n in range(concurrency) for route in ('/slow', '/broken')]
+    responses = await asyncio.gather(*[app.entry_handler_async(invoke_request(route, n))
+                                       for route, n in requests])
+    return [(route, response) for (route, _), response in zip(requests, responses)]
+
+
+def execution_log(project_dir):
+    return os.path.join(project_dir, 'executions.log')
+
+
+def new_app(project_dir, log_path):
+    if os.path.exists(log_path):
+        os.remove(log_path)
+    app = runtime.App(project_dir)
+    app.init_project()
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    files = {'api/slow.py': lambda project_dir: SLOW_HANDLER.format(log=execution_log(project_dir)),
+             'api/broken.py': lambda project_dir: BROKEN_HANDLER.format(log=execution_log(project_dir))}
+    with throwaway_project(MANIFEST, files) as project_dir:
+        log_path = execution_log(project_dir)
+        for round_number in range(args.rounds):
+            start = time.perf_counter()
+            app = new_app(project_dir, log_path)
+            check('threads', log_path, stress_threads(app, args.concurrency), args.concurrency)
+
+            app = new_app(project_dir, log_path)
+            check('asyncio', log_path, asyncio.run(stress_tasks(app, args.concurrency)), args.concurrency)
+            print(f'round {round_number + 1} passed in {time.perf_counter() - start:.2f}s')
+
+
+if __name__ == '__main__':
+    main()
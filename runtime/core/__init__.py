@@ -3,7 +3,10 @@ This module provides the core runtime for the Python runtime.
 """
 from ._app import App
 from ._model import InvokeRequest, InvokeResponse, RunType
+from ._const import PATH_METRICS, CONTENT_TYPE_METRICS
+from ._logger import shutdown_logger
 from . import _ctx as ctx
 
 __all__ = ["App", "InvokeRequest",
-           "InvokeResponse", "RunType", "ctx"]
+           "InvokeResponse", "RunType", "ctx", "PATH_METRICS", "CONTENT_TYPE_METRICS",
+           "shutdown_logger"]
@@ -1,15 +1,24 @@
 """
 This module provides the core runtime app.
 """
+import asyncio
+import contextvars
+import dataclasses
+import inspect
 import json
 import os
 import sys
+import threading
+import time
 import importlib.util
-from typing import Optional, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Dict, Union
 from traceback import format_exc
 
-from . import _const, _exception, _utils, _ctx
-from ._logger import get_sys_logger, get_user_logger, init_logger
+from . import _codec, _const, _exception, _metrics, _serde, _utils, _ctx
+from ._batch import MicroBatcher
+from ._cache import ResponseCache, cache_key
+from ._logger import build_log_fragment, get_sys_logger, get_user_logger, init_logger
 from ._model import InvokeRequest, InvokeResponse, Args, ResponseBody, RunType
 
 
@@ -51,41 +60,159 @@ class Route:
         route (str): The route.
         file (str): The file.
         user_function (object): The user function.
+        batch (dict): The micro-batching settings from the manifest, None when disabled.
+        batcher (MicroBatcher): Batches concurrent invocations, None when disabled.
+        warmup_input (Any): The synthetic input the handler is warmed up with on preload, None to skip.
+        warmup_function (Callable): The module's warmup hook, None if it has none.
+        artifacts (List[str]): Files the module loads, such as models, watched for hot reload.
+        input_as_dict (bool): Whether the handler takes the input as plain dicts and lists instead of namespaces.
+        deserializer (Callable): Validates the input into the module's declared ``Input`` type, None if it has none.
+        output_type (type): The module's declared ``Output`` type, None if it has none.
+        serializer (Callable): The serializer compiled for the output type, None to use serialize_obj.
+        loaded_versions (dict): The version of the file and every artifact when the module was loaded.
     """
     route: str
     file: str
     module_name: object
     user_function: object
+    batch: Optional[dict]
+    batcher: Optional[MicroBatcher]
+    warmup_input: object
+    warmup_function: Optional[Callable[[], None]]
+    artifacts: List[str]
+    batch_function: Optional[Callable]
+    input_as_dict: bool
+    deserializer: Optional[Callable]
+    output_type: Optional[type]
+    serializer: Optional[Callable]
+    loaded_versions: Optional[dict]
+    cache: Optional[ResponseCache]
 
-    def __init__(self, route: str = '', file: str = '') -> None:
+    def __init__(self, route: str = '', file: str = '', batch=None, warmup=None,
+                 artifacts: Optional[List[str]] = None, cache=None) -> None:
         self.route = trim_path(route)
         self.module_name = _const.MOUDLE_PREFIX + self.route.replace('/', '.')
         self.file = file
         self.user_function = None
+        # "batch": true enables batching with the default settings
+        self.batch = {} if batch is True else batch if isinstance(batch, dict) else None
+        self.batcher = None
+        self.batch_function = None
+        self.warmup_input = warmup
+        self.warmup_function = None
+        self.artifacts = list(artifacts or [])
+        self.input_as_dict = False
+        self.deserializer = None
+        self.output_type = None
+        self.serializer = None
+        self.loaded_versions = None
+        # The manifest's "cache" setting, None to leave it to the module's CACHE attribute
+        self.cache_config = cache
+        self.cache = None
+        self._load_lock = threading.Lock()
+        self._load_error = None
+        self._load_failures = 0
+        self._load_retry_at = 0.0
 
-    def invoke(self, args: Args):
+    def respond(self, args: Args) -> str:
         """
-        Invokes the user function with the provided parameters and context.
+        Invokes the user function and encodes its result, through the route's response cache if it has one.
 
         Args:
-            input (Any): The parameters to be passed to the user function.
-                        context (Any): The context object or data associated with the invocation.
+            args (Args): The parameters to be passed to the user function.
 
         Returns:
-            any: The response data returned by the user function.
+            str: The result encoded as JSON.
+        """
+        self._ensure_loaded()
+        cache = self.cache
+        if cache is None:
+            return self.serialize(self.invoke(args))
+        key = cache_key(args.input)
+        # Rejected inputs are neither hits nor misses
+        self.convert_input(args)
+        data = cache.get(key)
+        self._record_cache(cache, data is not None)
+        if data is None:
+            data = self.serialize(self._run(args))
+            cache.put(key, data)
+        return data
+
+    async def respond_async(self, args: Args) -> str:
+        """
+        Invokes the user function from a running event loop and encodes its
+        result, through the route's response cache if it has one.
+
+        Args:
+            args (Args): The parameters to be passed to the user function.
+
+        Returns:
+            str: The result encoded as JSON.
+        """
+        await self._ensure_loaded_async()
+        cache = self.cache
+        if cache is None:
+            return self.serialize(await self.invoke_async(args))
+        key = cache_key(args.input)
+        # Rejected inputs are neither hits nor misses
+        self.convert_input(args)
+        data = cache.get(key)
+        self._record_cache(cache, data is not None)
+        if data is None:
+            data = self.serialize(await self._run_async(args))
+            cache.put(key, data)
+        return data
+
+    def _record_cache(self, cache: ResponseCache, hit: bool) -> None:
+        """
+        Reports the cache lookup of the request and the route's counters in its headers.
+        """
+        _ctx.get_stopwatch().cache = f'{"hit" if hit else "miss"}, hits={cache.hits}, misses={cache.misses}'
+
+    def _ensure_loaded(self) -> None:
+        """
+        Loads the user function if it is not loaded yet, timing it as fn-load.
         """
         if self.user_function is None:
             try:
                 _ctx.get_stopwatch().fn_load_start()
-                self.user_function = self.load_func_module()
-            except Exception as e:
-                raise e
+                self.load()
+            finally:
+                _ctx.get_stopwatch().fn_load_end()
+
+    async def _ensure_loaded_async(self) -> None:
+        """
+        Loads the user function on the loop's default executor if it is not loaded yet, timing it as fn-load.
+        """
+        if self.user_function is None:
+            try:
+                _ctx.get_stopwatch().fn_load_start()
+                await asyncio.get_running_loop().run_in_executor(None, contextvars.copy_context().run, self.load)
             finally:
                 _ctx.get_stopwatch().fn_load_end()
 
+    def invoke(self, args: Args):
+        """
+        Invokes the user function with the provided parameters and context.
+
+        Args:
+            input (Any): The parameters to be passed to the user function.
+                        context (Any): The context object or data associated with the invocation.
+
+        Returns:
+            any: The response data returned by the user function.
+        """
+        self._ensure_loaded()
+        self.convert_input(args)
+        return self._run(args)
+
+    def _run(self, args: Args):
+        """
+        Calls the user function on converted parameters, timing it as fn-run.
+        """
         try:
             _ctx.get_stopwatch().fn_run_start()
-            data = self.user_function(args)
+            data = self._call(args)
         except Exception as e:
             raise _exception.FunctionExecutionError(
                 f'UserFuncExecErr: {e}\n{_utils.format_user_exception(2)}')
@@ -93,6 +220,267 @@ class Route:
             _ctx.get_stopwatch().fn_run_end()
         return data
 
+    async def invoke_async(self, args: Args):
+        """
+        Invokes the user function from a running event loop.
+
+        A coroutine handler is awaited on the loop. Loading the module and
+        calling a sync handler run on the loop's default executor, in a copy
+        of the current context so the runtime context follows them.
+
+        Args:
+            args (Args): The parameters to be passed to the user function.
+
+        Returns:
+            any: The response data returned by the user function.
+        """
+        await self._ensure_loaded_async()
+        self.convert_input(args)
+        return await self._run_async(args)
+
+    async def _run_async(self, args: Args):
+        """
+        Calls the user function on converted parameters from a running event loop, timing it as fn-run.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            _ctx.get_stopwatch().fn_run_start()
+            if self.batcher is None and inspect.iscoroutinefunction(self.user_function):
+                data = await self.user_function(args)
+            else:
+                data = await loop.run_in_executor(None, contextvars.copy_context().run, self._call, args)
+        except Exception as e:
+            raise _exception.FunctionExecutionError(
+                f'UserFuncExecErr: {e}\n{_utils.format_user_exception(2)}')
+        finally:
+            _ctx.get_stopwatch().fn_run_end()
+        return data
+
+    def invoke_batch(self, args_list: List[Args]) -> str:
+        """
+        Invokes the user function over many inputs.
+
+        The inputs go to the module's ``batch_handler`` in a single call if
+        it has one, bypassing the micro-batcher, and to ``handler`` one by
+        one otherwise or if the batch handler fails. An input that can't be
+        converted or whose invocation fails gets its own error, the others
+        are still answered.
+
+        Args:
+            args_list (List[Args]): The parameters of each invocation.
+
+        Returns:
+            str: The results as a JSON array, each item ``{"data": ...}`` or ``{"code": ..., "message": ...}``.
+        """
+        self._ensure_loaded()
+        items = [ResponseBody() for _ in args_list]
+        valid = self._convert_batch(args_list, items)
+        try:
+            _ctx.get_stopwatch().fn_run_start()
+            outcomes = self._call_batch([args_list[i] for i in valid])
+        finally:
+            _ctx.get_stopwatch().fn_run_end()
+        return self._encode_batch(items, valid, outcomes)
+
+    async def invoke_batch_async(self, args_list: List[Args]) -> str:
+        """
+        Invokes the user function over many inputs from a running event loop.
+
+        A coroutine handler without a batch handler is awaited concurrently
+        for every input on the loop, anything else runs on the loop's default
+        executor like ``invoke_async``.
+
+        Args:
+            args_list (List[Args]): The parameters of each invocation.
+
+        Returns:
+            str: The results as a JSON array, see ``invoke_batch``.
+        """
+        loop = asyncio.get_running_loop()
+        await self._ensure_loaded_async()
+        if self.batch_function is not None or not inspect.iscoroutinefunction(self.user_function):
+            return await loop.run_in_executor(None, contextvars.copy_context().run, self.invoke_batch, args_list)
+
+        items = [ResponseBody() for _ in args_list]
+        valid = self._convert_batch(args_list, items)
+        try:
+            _ctx.get_stopwatch().fn_run_start()
+            outcomes = await self._gather_batch([args_list[i] for i in valid])
+        finally:
+            _ctx.get_stopwatch().fn_run_end()
+        return self._encode_batch(items, valid, outcomes)
+
+    def _convert_batch(self, args_list: List[Args], items: List[ResponseBody]) -> List[int]:
+        """
+        Converts the input of every invocation, setting the error of those that can't be.
+
+        Returns:
+            List[int]: The indexes of the converted invocations.
+        """
+        valid = []
+        for i, args in enumerate(args_list):
+            try:
+                self.convert_input(args)
+            except _exception.BaseError as e:
+                items[i].error(e)
+            else:
+                valid.append(i)
+        return valid
+
+    def _call_batch(self, args_list: List[Args]) -> list:
+        """
+        Calls the loaded user function over many converted inputs.
+
+        Returns:
+            list: The result of each invocation, or the exception it raised.
+        """
+        if not args_list:
+            return []
+        if self.batch_function is not None:
+            try:
+                results = self.batch_function(args_list)
+                if results is None or len(results) != len(args_list):
+                    raise _exception.FunctionExecutionError(
+                        f'batch handler returned {0 if results is None else len(results)} '
+                        f'results for {len(args_list)} inputs')
+                return list(results)
+            except Exception as e:
+                get_user_logger().warning('batch handler failed for function(%s), invoking handler per input: %s',
+                                          self.route, e)
+        if inspect.iscoroutinefunction(self.user_function):
+            return asyncio.run(self._gather_batch(args_list))
+        outcomes = []
+        for args in args_list:
+            try:
+                outcomes.append(self._call_handler(args))
+            except Exception as e:
+                outcomes.append(e)
+        return outcomes
+
+    async def _gather_batch(self, args_list: List[Args]) -> list:
+        """
+        Awaits a coroutine handler concurrently over many converted inputs.
+
+        Returns:
+            list: The result of each invocation, or the exception it raised.
+        """
+        return await asyncio.gather(*[self.user_function(args) for args in args_list], return_exceptions=True)
+
+    def _encode_batch(self, items: List[ResponseBody], valid: List[int], outcomes: list) -> str:
+        """
+        Sets the outcome of every invocation on its response item and encodes the items.
+
+        Returns:
+            str: The items as a JSON array.
+        """
+        for i, outcome in zip(valid, outcomes):
+            if isinstance(outcome, BaseException):
+                items[i].error(_exception.FunctionExecutionError(f'UserFuncExecErr: {outcome}'))
+                continue
+            try:
+                items[i].data = self.serialize(outcome)
+            except Exception as e:
+                items[i].error(_exception.RuntimeSystemError(f'SysErr: {e}'))
+        failed = [item for item in items if item.code]
+        if failed:
+            get_user_logger().error('user error %s %d of %d inputs failed, first: %s',
+                                    self.route, len(failed), len(items), failed[0].message)
+        return '[' + ','.join(item.to_json() for item in items) + ']'
+
+    def convert_input(self, args: Args) -> None:
+        """
+        Converts the decoded input to the form the loaded handler takes.
+
+        A module that sets ``INPUT_AS_DICT = True`` gets the decoded dicts
+        and lists as they are. Otherwise a module that declares an ``Input``
+        type gets an instance of it, validated by the deserializer compiled
+        at load, and any other module gets lazily converted namespaces.
+
+        Args:
+            args (Args): The invocation arguments, converted in place.
+
+        Raises:
+            RequestInvalidBodyError: If the input does not match the ``Input`` type.
+        """
+        if self.input_as_dict:
+            return
+        if self.deserializer is not None:
+            args.input = self.deserializer(args.input)
+        else:
+            args.input = _utils.lazy_namespace(args.input)
+
+    def _call(self, args: Args):
+        """
+        Calls the loaded user function, through the batcher if there is one.
+        """
+        if self.batcher is not None:
+            return self.batcher.submit(args)
+        return self._call_handler(args)
+
+    def _call_handler(self, args: Args):
+        """
+        Calls the loaded user function directly.
+
+        A coroutine handler called from a thread without an event loop is run
+        to completion on a new loop.
+        """
+        if inspect.iscoroutinefunction(self.user_function):
+            return asyncio.run(self.user_function(args))
+        return self.user_function(args)
+
+    def load(self) -> None:
+        """
+        Loads the user function if it is not loaded yet.
+
+        Concurrent first callers wait for a single import of the module. A
+        failed import is cached: callers get the same error without importing
+        again until a retry delay, doubling with every failure, has passed.
+        """
+        if self.user_function is not None:
+            return
+        with self._load_lock:
+            if self.user_function is not None:
+                return
+            if self._load_error is not None and time.monotonic() < self._load_retry_at:
+                raise self._load_error.with_traceback(None)
+            versions = self.file_versions()
+            try:
+                user_function = self.load_func_module()
+            except Exception as e:
+                self._load_failures += 1
+                self._load_error = e
+                self._load_retry_at = time.monotonic() + min(
+                    _const.LOAD_RETRY_MAX_SECONDS,
+                    _const.LOAD_RETRY_BASE_SECONDS * 2 ** (self._load_failures - 1))
+                raise
+            self._load_error = None
+            self._load_failures = 0
+            self.loaded_versions = versions
+            # Published last, once the batcher and warmup hook are set
+            self.user_function = user_function
+
+    def file_versions(self) -> dict:
+        """
+        Gets the current version of the route file and of every artifact.
+
+        Returns:
+            dict: The modification time and size of each file, None for a missing file.
+        """
+        return {path: _utils.file_version(path) for path in [self.file, *self.artifacts]}
+
+    def same_config(self, other: 'Route') -> bool:
+        """
+        Checks whether another route is declared the same way in the manifest.
+
+        Args:
+            other (Route): The other route.
+
+        Returns:
+            bool: True if both routes have the same file and settings.
+        """
+        return (self.route, self.file, self.batch, self.warmup_input, self.artifacts, self.cache_config) == \
+            (other.route, other.file, other.batch, other.warmup_input, other.artifacts, other.cache_config)
+
     def load_func_module(self):
         """
         Loads the user function module.
@@ -113,7 +501,7 @@ class Route:
                 f'SyntaxError: {self.module_name} {e}')
 
         try:
-            user_func = func_module.handler
+            user_func = getattr(func_module, _const.MODULE_ATTR_HANDLER)
         except AttributeError as e:
             raise _exception.FunctionExecutionError(
                 f'missing handler as entry for function({self.route})') from e
@@ -124,8 +512,121 @@ class Route:
         elif not callable(user_func):
             raise _exception.FunctionExecutionError(
                 f'handler should be as function type for function({self.route})')
+
+        batch_func = getattr(func_module, _const.MODULE_ATTR_BATCH_HANDLER, None)
+        self.batch_function = batch_func if callable(batch_func) else None
+        if self.batch is not None:
+            self.batcher = self._build_batcher(func_module)
+        self.input_as_dict = getattr(func_module, _const.MODULE_ATTR_INPUT_AS_DICT, False) is True
+        if not self.input_as_dict:
+            self.deserializer = _serde.build_deserializer(
+                getattr(func_module, _const.MODULE_ATTR_INPUT, None))
+        self._build_serializer(func_module)
+        self.cache = self._build_cache(func_module)
+        warmup_func = getattr(func_module, _const.MODULE_ATTR_WARMUP, None)
+        self.warmup_function = warmup_func if callable(warmup_func) else None
         return user_func
 
+    def _build_serializer(self, func_module) -> None:
+        """
+        Compiles the serializer of the module's declared ``Output`` type.
+
+        Not needed when the codec encodes dataclasses natively, which is
+        faster than any serializer written in Python.
+
+        Args:
+            func_module (module): The loaded user function module.
+        """
+        output_type = getattr(func_module, _const.MODULE_ATTR_OUTPUT, None)
+        self.output_type = output_type if isinstance(output_type, type) else None
+        self.serializer = None
+        if self.output_type is None:
+            return
+        if dataclasses.is_dataclass(self.output_type) and _codec.get_codec().serializes_dataclasses:
+            return
+        self.serializer = _serde.build_serializer(self.output_type)
+
+    def serialize(self, data) -> str:
+        """
+        Encodes the result of the user function as JSON.
+
+        An instance of the declared ``Output`` type goes through the compiled
+        serializer, anything else through serialize_obj.
+
+        Args:
+            data (any): The result of the user function.
+
+        Returns:
+            str: The JSON document.
+        """
+        if self.serializer is not None and type(data) is self.output_type:
+            return _codec.dumps(self.serializer(data))
+        return _codec.dumps(data, default=serialize_obj)
+
+    def warmup(self, args: Args) -> None:
+        """
+        Warms up the loaded route before it takes traffic.
+
+        Calls the module's ``warmup()`` hook, then the handler once with the
+        warmup input from the manifest, if either is defined.
+
+        Args:
+            args (Args): The invocation arguments built from the warmup input.
+        """
+        if self.warmup_function is not None:
+            self.warmup_function()
+        if self.warmup_input is not None:
+            self.convert_input(args)
+            # Bypass the batcher, its thread must not start before pre-fork workers are forked
+            self._call_handler(args)
+
+    def _build_cache(self, func_module) -> Optional[ResponseCache]:
+        """
+        Builds the response cache of a route that enables it.
+
+        ``"cache"`` in the manifest entry, or a ``CACHE`` attribute of the
+        module when the manifest does not set it, enables the cache with
+        ``true`` or a dict of settings.
+
+        Args:
+            func_module (module): The loaded user function module.
+
+        Returns:
+            ResponseCache: The cache, None if the route does not enable it.
+        """
+        setting = self.cache_config
+        if setting is None:
+            setting = getattr(func_module, _const.MODULE_ATTR_CACHE, None)
+        if setting is True:
+            setting = {}
+        if not isinstance(setting, dict):
+            return None
+        return ResponseCache(
+            setting.get(_const.MANIFEST_KEY_CACHE_MAX_ENTRIES, _const.CACHE_DEFAULT_MAX_ENTRIES),
+            setting.get(_const.MANIFEST_KEY_CACHE_MAX_BYTES, _const.CACHE_DEFAULT_MAX_BYTES),
+            setting.get(_const.MANIFEST_KEY_CACHE_TTL_SECONDS))
+
+    def _build_batcher(self, func_module) -> Optional[MicroBatcher]:
+        """
+        Builds the micro-batcher for a route that enables batching in the manifest.
+
+        Args:
+            func_module (module): The loaded user function module.
+
+        Returns:
+            MicroBatcher: The batcher, None if the module has no batch handler.
+        """
+        batch_func = getattr(func_module, _const.MODULE_ATTR_BATCH_HANDLER, None)
+        if not callable(batch_func):
+            get_sys_logger().warning('batch enabled but %s is missing for function(%s), '
+                                     'invoking handler per request',
+                                     _const.MODULE_ATTR_BATCH_HANDLER, self.route)
+            return None
+        return MicroBatcher(
+            batch_func,
+            self.batch.get(_const.MANIFEST_KEY_BATCH_MAX_SIZE, _const.BATCH_DEFAULT_MAX_SIZE),
+            self.batch.get(_const.MANIFEST_KEY_BATCH_MAX_WAIT_MS, _const.BATCH_DEFAULT_MAX_WAIT_MS))
+
 
 class App:
     """
@@ -133,28 +634,39 @@ class App:
 
     Attributes:
         project_path (str): The path to the project.
+        preload (bool): Whether init_project loads and warms up every route.
+        log_queue_size (int): Log on a background thread through a queue of this size, None to log synchronously.
     """
     project_path: str
     manifest_content: str
     route_map: Dict[str, Route]
     run_type: RunType
+    preload: bool
+    log_queue_size: Optional[int]
 
-    def __init__(self, project_path: str, run_type: RunType = RunType.PROXY) -> None:
+    def __init__(self, project_path: str, run_type: RunType = RunType.PROXY, preload: bool = False,
+                 log_queue_size: Optional[int] = None) -> None:
         self.project_path = project_path
         self.route_map = {}
         self.manifest_content = ''
         self.run_type = run_type
+        self.preload = preload
+        self.log_queue_size = log_queue_size
 
     def init_project(self) -> None:
         """
         Initializes the project.
 
+        With preload enabled, by the constructor or by ``"preload": true`` in
+        the manifest, every route is loaded and warmed up here, so the cost
+        is reported as fn-init instead of the first request's fn-load.
+
         Args:
             project_path (str): The path to the project.
         """
 
         _utils.Stopwatch.project_init_start()
-        init_logger(self.run_type)
+        init_logger(self.run_type, self.log_queue_size)
         get_sys_logger().info("project path: %s", self.project_path)
 
         _utils.set_functions_dir_path(
@@ -165,6 +677,8 @@ class App:
         sys.path.append(os.path.join(self.project_path))
 
         self._load_manifest(self.project_path)
+        if self.preload:
+            self.preload_routes()
         _utils.Stopwatch.project_init_end()
 
     def _load_manifest(self, project_path: str) -> None:
@@ -187,22 +701,211 @@ class App:
             json_data = json.loads(self.manifest_content)
 
             # 访问 JSON 数据
-            apis = json_data.get(_const.MANIFEST_KEY_API, [])
-            if isinstance(apis, list):
-                for api in apis:
-                    file = os.path.join(
-                        project_path, api.get(_const.MANIFEST_KEY_FILE))
-                    route = Route(
-                        api.get(_const.MANIFEST_KEY_ROUTE), file)
-                    self.route_map[route.route] = route
-                    get_sys_logger().info('load manifest %s %s',
-                                          route.route, route.file)
-            else:
-                get_sys_logger().info("apis is not list")
+            if json_data.get(_const.MANIFEST_KEY_PRELOAD) is True:
+                self.preload = True
+            self.route_map = self._parse_routes(json_data, project_path)
         except Exception as e:
             get_sys_logger().error('load manifest error %s', e)
 
-    def _build_args(self, body: Optional[str]) -> Args:
+    def _parse_routes(self, json_data: dict, project_path: str) -> Dict[str, Route]:
+        """
+        Builds the routes declared in the manifest.
+
+        Args:
+            json_data (dict): The parsed manifest.
+            project_path (str): The path to the project.
+
+        Returns:
+            Dict[str, Route]: The routes by path.
+        """
+        route_map = {}
+        apis = json_data.get(_const.MANIFEST_KEY_API, [])
+        if isinstance(apis, list):
+            for api in apis:
+                file = os.path.join(
+                    project_path, api.get(_const.MANIFEST_KEY_FILE))
+                artifacts = [os.path.join(project_path, artifact)
+                             for artifact in api.get(_const.MANIFEST_KEY_ARTIFACTS) or []]
+                route = Route(
+                    api.get(_const.MANIFEST_KEY_ROUTE), file,
+                    api.get(_const.MANIFEST_KEY_BATCH),
+                    api.get(_const.MANIFEST_KEY_WARMUP),
+                    artifacts,
+                    api.get(_const.MANIFEST_KEY_CACHE))
+                route_map[route.route] = route
+                get_sys_logger().info('load manifest %s %s',
+                                      route.route, route.file)
+        else:
+            get_sys_logger().info("apis is not list")
+        return route_map
+
+    def preload_routes(self) -> None:
+        """
+        Loads and warms up every route in the manifest ahead of the first request.
+
+        Routes are loaded in parallel threads. A route that fails to load is
+        logged and loaded again on its first invocation.
+        """
+        routes = list(self.route_map.values())
+        if not routes:
+            return
+        workers = min(len(routes), _const.PRELOAD_MAX_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='preload') as executor:
+            for route in routes:
+                executor.submit(self._preload_route, route)
+
+    def _preload_route(self, route: Route) -> None:
+        """
+        Loads and warms up one route, logging any error.
+
+        Args:
+            route (Route): The route to preload.
+        """
+        try:
+            route.load()
+        except Exception as e:
+            get_sys_logger().error('preload %s error %s', route.route, e)
+            return
+        try:
+            self._warmup_route(route)
+            get_sys_logger().info('preload %s', route.route)
+        except Exception as e:
+            get_sys_logger().error('warmup %s error %s', route.route, e)
+
+    def _warmup_route(self, route: Route) -> None:
+        """
+        Warms up a loaded route in its own runtime context.
+
+        Args:
+            route (Route): The route to warm up.
+        """
+        def warmup():
+            _ctx.init()
+            try:
+                route.warmup(self._build_args(_codec.dumps({'input': route.warmup_input})))
+            finally:
+                _ctx.clear()
+        contextvars.Context().run(warmup)
+
+    def watch(self, interval: float = _const.RELOAD_INTERVAL_SECONDS) -> None:
+        """
+        Starts reloading routes in the background when their files change.
+
+        A daemon thread polls the modification time of the manifest, of
+        every loaded route's file and of the artifacts its manifest entry
+        lists. A change is picked up once the file has stayed the same for
+        one more interval, so a file that is still being written is not
+        loaded. The new route is loaded and warmed up off the request path
+        and then swapped into route_map; requests already holding the old
+        route finish on it. If the new version fails to load, the old route
+        keeps serving.
+
+        Args:
+            interval (float): The polling interval in seconds.
+        """
+        thread = threading.Thread(target=self._watch, args=(interval,),
+                                  name='route-reloader', daemon=True)
+        thread.start()
+
+    def _watch(self, interval: float) -> None:
+        manifest_path = os.path.join(self.project_path, _const.FILE_MANIFEST)
+        manifest_version = _utils.file_version(manifest_path)
+        # The version seen on the previous poll, a change is applied once it is seen twice
+        pending = {}
+        # The version that failed to load, not retried until the files change again
+        failed = {}
+        while True:
+            time.sleep(interval)
+            try:
+                version = _utils.file_version(manifest_path)
+                if version != manifest_version:
+                    if pending.get(manifest_path) == version:
+                        manifest_version = version
+                        self._reload_manifest(manifest_path)
+                        pending.clear()
+                        failed.clear()
+                    else:
+                        pending[manifest_path] = version
+                    continue
+                for route in list(self.route_map.values()):
+                    if route.user_function is None:
+                        # Not loaded yet, its first invocation loads the current files
+                        continue
+                    versions = route.file_versions()
+                    if versions == route.loaded_versions or versions == failed.get(route.route):
+                        continue
+                    if pending.get(route.route) != versions:
+                        pending[route.route] = versions
+                        continue
+                    if not self._reload_route(route):
+                        failed[route.route] = versions
+            except Exception as e:
+                get_sys_logger().error('reload error %s', e)
+
+    def _reload_route(self, route: Route) -> bool:
+        """
+        Loads a new version of a route and swaps it in.
+
+        Args:
+            route (Route): The route currently serving.
+
+        Returns:
+            bool: True if the new version is serving, False if the old one is kept.
+        """
+        new_route = Route(route.route, route.file, route.batch, route.warmup_input, route.artifacts,
+                          route.cache_config)
+        try:
+            new_route.load()
+            self._warmup_route(new_route)
+        except Exception as e:
+            get_sys_logger().error('reload %s error, keep serving the previous version %s',
+                                   route.route, e)
+            return False
+        route_map = dict(self.route_map)
+        route_map[new_route.route] = new_route
+        self.route_map = route_map
+        get_sys_logger().info('reload %s', new_route.route)
+        return True
+
+    def _reload_manifest(self, manifest_path: str) -> None:
+        """
+        Applies a changed manifest, loading new and changed routes before swapping them in.
+
+        Routes declared as before keep serving unchanged. A changed route
+        that was loaded, or any route when preload is enabled, is loaded and
+        warmed up first; if that fails, the old route keeps serving.
+
+        Args:
+            manifest_path (str): The path to the manifest.
+        """
+        with open(manifest_path, encoding="utf-8") as file:
+            manifest_content = file.read()
+        try:
+            json_data = json.loads(manifest_content)
+        except ValueError as e:
+            get_sys_logger().error('reload manifest error %s', e)
+            return
+        route_map = {}
+        for name, new_route in self._parse_routes(json_data, self.project_path).items():
+            old_route = self.route_map.get(name)
+            if old_route is not None and old_route.same_config(new_route):
+                route_map[name] = old_route
+                continue
+            if self.preload or (old_route is not None and old_route.user_function is not None):
+                try:
+                    new_route.load()
+                    self._warmup_route(new_route)
+                except Exception as e:
+                    get_sys_logger().error('reload %s error %s', name, e)
+                    if old_route is not None:
+                        route_map[name] = old_route
+                        continue
+            route_map[name] = new_route
+        self.manifest_content = manifest_content
+        self.route_map = route_map
+        get_sys_logger().info('reload manifest %s', manifest_path)
+
+    def _build_args(self, body: Optional[str]) -> Union[Args, List[Args]]:
         """
         Build the Args object from the provided invoke request.
 
@@ -211,24 +914,40 @@ class App:
 
         Returns:
             Args: The Args object containing the parameters and context from the invoke request.
+                The input is decoded JSON, the route converts it for its handler. A batch
+                envelope, ``{"inputs": [...]}``, gives a list of Args, one per input.
 
+        Raises:
+            RequestInvalidBodyError: If the inputs of a batch envelope are not a list, or too many.
         """
         args = Args()
         args.logger = get_user_logger()
         if body is None:
             return args
 
-        body_dict = json.loads(body)
-        input = body_dict.get('input', None)
+        body_dict = _codec.loads(body)
+        if 'inputs' in body_dict:
+            inputs = body_dict['inputs']
+            if not isinstance(inputs, list):
+                raise _exception.RequestInvalidBodyError('inputs should be a list')
+            if len(inputs) > _const.BATCH_INVOKE_MAX_INPUTS:
+                raise _exception.RequestInvalidBodyError(
+                    f'{len(inputs)} inputs exceed the limit of {_const.BATCH_INVOKE_MAX_INPUTS}')
+            return [Args(input=self._parse_input(input), logger=args.logger) for input in inputs]
+
+        args.input = self._parse_input(body_dict.get('input', None))
+        return args
+
+    def _parse_input(self, input):
+        """
+        Decodes an input sent as a JSON string, leaving any other input as it is.
+        """
         if isinstance(input, str):
             try:
-                input = json.loads(input)
+                input = _codec.loads(input)
             except ValueError as e:
                 get_sys_logger().info(e)
-        input = _utils.dict_to_namespace(input)
-
-        args.input = input
-        return args
+        return input
 
     def _parse_headers(self, headers: dict):
         """
@@ -243,23 +962,25 @@ class App:
                     _const.HTTP_HEADER_X_RUNTIME_REQUEST_ID))
 
                 if _const.HTTP_HEADER_X_RUNTIME_EVENT in headers:
-                    runtime_event = json.loads(headers.get(
+                    runtime_event = _codec.loads(headers.get(
                         _const.HTTP_HEADER_X_RUNTIME_EVENT))
                     _ctx.add_ctx_key(
                         _const.CTX_KEY_RUNTIME_EVENT, runtime_event)
         except ValueError as e:
             get_sys_logger().error(e)
+        # Serialized once here instead of on every log line of the request
+        _ctx.set_log_fragment(build_log_fragment(
+            _ctx.get_request_id(), _ctx.get_ctx_key(_const.CTX_KEY_RUNTIME_EVENT)))
 
-    def _invoke(self, user_func_path: str, args: Args):
+    def _get_route(self, user_func_path: str) -> Route:
         """
-        Invokes the user function with the provided parameters and context.
+        Looks up the route of the invoked user function.
 
         Args:
-            input (Any): The parameters to be passed to the user function.
-            context (Any): The context object or data associated with the invocation.
+            user_func_path (str): The path of the user function.
 
         Returns:
-            any: The response data returned by the user function.
+            Route: The route of the user function.
         """
         get_sys_logger().info('invoke %s', user_func_path)
 
@@ -268,7 +989,40 @@ class App:
         if route is None:
             raise _exception.FunctionNotFoundError(
                 f'function({user_func_path}) is not found')
-        return route.invoke(args)
+        return route
+
+    def _invoke(self, user_func_path: str, args: Union[Args, List[Args]]):
+        """
+        Invokes the user function with the provided parameters and context.
+
+        Args:
+            input (Any): The parameters to be passed to the user function.
+            context (Any): The context object or data associated with the invocation.
+
+        Returns:
+            str: The response data returned by the user function, encoded as JSON.
+                For a list of Args, the JSON array of each invocation's result or error.
+        """
+        route = self._get_route(user_func_path)
+        if isinstance(args, list):
+            return route.invoke_batch(args)
+        return route.respond(args)
+
+    async def _invoke_async(self, user_func_path: str, args: Union[Args, List[Args]]):
+        """
+        Invokes the user function from a running event loop.
+
+        Args:
+            user_func_path (str): The path of the user function.
+            args (Args): The parameters to be passed to the user function, a list for a batch.
+
+        Returns:
+            str: The response data returned by the user function, encoded as JSON.
+        """
+        route = self._get_route(user_func_path)
+        if isinstance(args, list):
+            return await route.invoke_batch_async(args)
+        return await route.respond_async(args)
 
     def entry_handler(self, invoke_request: InvokeRequest) -> InvokeResponse:
         """
@@ -283,26 +1037,98 @@ class App:
         _ctx.init()
         user_func_path = invoke_request.url
         if user_func_path == _const.PATH_MANIFEST:
-            _ctx.get_stopwatch().fn_end()
-            headers = _ctx.get_stopwatch().to_time_headers()
-            _ctx.clear()
-            resp = InvokeResponse(body=self.manifest_content, headers=headers)
-            return resp
+            return self._finish(self.manifest_content)
+        if user_func_path == _const.PATH_METRICS:
+            return self._finish(self.metrics(), content_type=_const.CONTENT_TYPE_METRICS)
+        body = ResponseBody()
+        try:
+            args = self._build_args(invoke_request.body)
+            self._parse_headers(invoke_request.headers)
+            body.data = self._invoke(user_func_path, args)
+        except Exception as e:
+            self._handle_error(body, user_func_path, e)
+        return self._finish(body.to_json(), user_func_path, body.code)
+
+    async def entry_handler_async(self, invoke_request: InvokeRequest) -> InvokeResponse:
+        """
+        Handles an invoke request from a running event loop.
+
+        Must be awaited in its own task, so every request gets its own
+        runtime context and stopwatch.
+
+        Args:
+            request (InvokeRequest): The invoke request.
+
+        Returns:
+            InvokeResponse: The invoke response.
+        """
+        _ctx.init()
+        user_func_path = invoke_request.url
+        if user_func_path == _const.PATH_MANIFEST:
+            return self._finish(self.manifest_content)
+        if user_func_path == _const.PATH_METRICS:
+            return self._finish(self.metrics(), content_type=_const.CONTENT_TYPE_METRICS)
         body = ResponseBody()
         try:
             args = self._build_args(invoke_request.body)
             self._parse_headers(invoke_request.headers)
-            body.data = json.dumps(self._invoke(user_func_path, args), default=serialize_obj)
-        except _exception.BaseError as e:
+            body.data = await self._invoke_async(user_func_path, args)
+        except Exception as e:
+            self._handle_error(body, user_func_path, e)
+        return self._finish(body.to_json(), user_func_path, body.code)
+
+    def _handle_error(self, body: ResponseBody, user_func_path: str, e: Exception) -> None:
+        """
+        Logs an invocation error and sets it on the response body.
+
+        Args:
+            body (ResponseBody): The response body.
+            user_func_path (str): The path of the user function.
+            e (Exception): The error.
+        """
+        if isinstance(e, _exception.BaseError):
             get_user_logger().error('user error %s %s', user_func_path, format_exc())
             body.error(e)
-        except Exception as e:
+        else:
             get_sys_logger().error('SysErr %s %s', user_func_path, format_exc())
             body.error(_exception.RuntimeSystemError(
                 f'SysErr: {e}'))
-        finally:
-            _ctx.get_stopwatch().fn_end()
-            headers = _ctx.get_stopwatch().to_time_headers()
-            _ctx.clear()
-            resp = InvokeResponse(body=body.to_json(), headers=headers)
-        return resp
+
+    def _finish(self, body: str, user_func_path: Optional[str] = None, error_code: Optional[str] = None,
+                content_type: Optional[str] = None) -> InvokeResponse:
+        """
+        Stops the stopwatch, records the request's metrics and clears the runtime context of the request.
+
+        Args:
+            body (str): The response body.
+            user_func_path (str, optional): The path of the invoked user function, None for meta paths.
+                Only requests to routes in the manifest are recorded.
+            error_code (str, optional): The code of the error the request was answered with.
+            content_type (str, optional): The Content-Type header of the response.
+
+        Returns:
+            InvokeResponse: The invoke response with the timing headers.
+        """
+        stopwatch = _ctx.get_stopwatch()
+        stopwatch.fn_end()
+        if user_func_path is not None:
+            route = trim_path(user_func_path)
+            if route in self.route_map:
+                _metrics.record(route, stopwatch.durations, error_code)
+        headers = stopwatch.to_time_headers()
+        if content_type is not None:
+            headers['Content-Type'] = content_type
+        _ctx.clear()
+        return InvokeResponse(body=body, headers=headers)
+
+    def metrics(self) -> str:
+        """
+        Renders the per-route latency histograms and error counters, and the
+        counters of the routes' response caches.
+
+        Returns:
+            str: The metrics in the Prometheus text exposition format.
+        """
+        caches = sorted(((name, route.cache) for name, route in self.route_map.items() if route.cache is not None),
+                        key=lambda item: item[0])
+        return _metrics.render() + _metrics.render_caches(caches)
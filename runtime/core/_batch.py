@@ -0,0 +1,106 @@
+"""
+This module provides the core runtime micro-batching.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List, Optional
+
+from . import _const, _ctx, _exception
+
+
+class MicroBatcher:
+    """
+    Collects concurrent invocations of one route and runs them as a single batch.
+
+    The first waiting invocation opens a batch, which is dispatched when it
+    holds ``max_size`` inputs or ``max_wait_ms`` have passed, whichever
+    comes first. The window is only waited for after a batch of more than
+    one input, so invocations that come one at a time, like those of a
+    server without a thread pool, are dispatched at once; the inputs
+    submitted while a batch runs are collected into the next one anyway.
+    The batch handler is called once with the list of inputs and each
+    result is handed back to the invocation that submitted it. It runs
+    with the log fields of the request that opened the batch.
+    The dispatcher thread exits when idle, so a batcher that is no longer
+    used, like one of a hot-reloaded route, does not keep its handler alive.
+
+    Attributes:
+        batch_function (Callable): The batch-aware user function.
+        max_size (int): The maximum number of inputs per batch.
+        max_wait (float): The maximum time in seconds a batch waits to fill up.
+    """
+    batch_function: Callable[[list], list]
+    max_size: int
+    max_wait: float
+
+    def __init__(self, batch_function: Callable[[list], list],
+                 max_size: int = _const.BATCH_DEFAULT_MAX_SIZE,
+                 max_wait_ms: float = _const.BATCH_DEFAULT_MAX_WAIT_MS) -> None:
+        self.batch_function = batch_function
+        self.max_size = max(1, int(max_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+
+    def submit(self, args):
+        """
+        Adds the input to the next batch and waits for its result.
+
+        Args:
+            args (Args): The invocation arguments.
+
+        Returns:
+            any: The result of this input.
+        """
+        future = Future()
+        # Enqueued under the lock, so an idle worker can't exit past this input
+        with self._lock:
+            self._queue.put((args, future, _ctx.get_log_fragment()))
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name='micro-batcher', daemon=True)
+                self._worker.start()
+        return future.result()
+
+    def _run(self) -> None:
+        _ctx.init()
+        last_size = 0
+        while True:
+            try:
+                batch = [self._queue.get(timeout=_const.BATCH_IDLE_SECONDS)]
+            except queue.Empty:
+                with self._lock:
+                    if self._queue.empty():
+                        self._worker = None
+                        return
+                continue
+            deadline = time.monotonic() + (self.max_wait if last_size > 1 else 0)
+            while len(batch) < self.max_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0:
+                        batch.append(self._queue.get(timeout=remaining))
+                    else:
+                        batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            last_size = len(batch)
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: List[tuple]) -> None:
+        _ctx.set_log_fragment(batch[0][2])
+        try:
+            results = self.batch_function([args for args, _, _ in batch])
+            if results is None or len(results) != len(batch):
+                raise _exception.FunctionExecutionError(
+                    f'batch handler returned {0 if results is None else len(results)} '
+                    f'results for {len(batch)} inputs')
+        except Exception as e:
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+        for (_, future, _), result in zip(batch, results):
+            future.set_result(result)
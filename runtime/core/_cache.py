@@ -0,0 +1,112 @@
+"""
+This module provides the core runtime response cache.
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def cache_key(input) -> bytes:
+    """
+    Hashes an input by its canonical JSON, so equal inputs get the same key
+    whatever the order of their object keys.
+
+    Args:
+        input (Any): The decoded JSON input.
+
+    Returns:
+        bytes: The SHA-256 digest of the canonical JSON.
+    """
+    if orjson is not None:
+        try:
+            canonical = orjson.dumps(input, option=orjson.OPT_SORT_KEYS)
+        except TypeError:
+            # Integers beyond 64 bits, which the standard library encodes
+            canonical = json.dumps(input, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    else:
+        canonical = json.dumps(input, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    return hashlib.sha256(canonical).digest()
+
+
+class ResponseCache:
+    """
+    A thread-safe LRU cache of encoded responses.
+
+    The least recently used entries are evicted once there are more than
+    ``max_entries`` or their encoded responses take more than ``max_bytes``.
+    With a ``ttl_seconds``, an entry older than that is a miss.
+
+    Attributes:
+        hits (int): The number of lookups that found a response.
+        misses (int): The number of lookups that did not.
+    """
+    hits: int
+    misses: int
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: Optional[float] = None) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: bytes) -> Optional[str]:
+        """
+        Looks up a response, marking it as the most recently used.
+
+        Args:
+            key (bytes): The key of the input.
+
+        Returns:
+            str: The encoded response, None if there is none or it expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or time.monotonic() < expires_at:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.size -= len(key) + len(value)
+            self.misses += 1
+            return None
+
+    def put(self, key: bytes, value: str) -> None:
+        """
+        Stores a response, evicting the least recently used ones beyond the limits.
+
+        A response larger than ``max_bytes`` on its own is not stored.
+
+        Args:
+            key (bytes): The key of the input.
+            value (str): The encoded response.
+        """
+        size = len(key) + len(value)
+        if size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(key) + len(previous[0])
+            self._entries[key] = (value, expires_at)
+            self.size += size
+            while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+                evicted_key, (evicted, _) = self._entries.popitem(last=False)
+                self.size -= len(evicted_key) + len(evicted)
+
+    def __len__(self) -> int:
+        return len(self._entries)
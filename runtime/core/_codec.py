@@ -0,0 +1,91 @@
+"""
+This module provides the core runtime JSON codec.
+"""
+import json
+from typing import Callable, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JsonCodec:
+    """
+    Encodes and decodes JSON with the standard library.
+    """
+    name = 'json'
+    serializes_dataclasses = False
+
+    def loads(self, data: Union[str, bytes]):
+        """
+        Decodes a JSON document.
+        """
+        return json.loads(data)
+
+    def dumps(self, obj, default: Optional[Callable] = None) -> str:
+        """
+        Encodes an object as a compact JSON document.
+        """
+        return json.dumps(obj, default=default, separators=(',', ':'))
+
+
+class OrjsonCodec:
+    """
+    Encodes and decodes JSON with orjson.
+
+    Dataclasses are encoded natively. Dict keys that are not strings and
+    numpy arrays and scalars are encoded like the standard library and
+    ``serialize_obj`` would.
+    """
+    name = 'orjson'
+    serializes_dataclasses = True
+    options = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if orjson is not None else 0
+
+    def loads(self, data: Union[str, bytes]):
+        """
+        Decodes a JSON document.
+        """
+        return orjson.loads(data)
+
+    def dumps(self, obj, default: Optional[Callable] = None) -> str:
+        """
+        Encodes an object as a compact JSON document.
+        """
+        return orjson.dumps(obj, default=default, option=self.options).decode('utf-8')
+
+
+_codec = OrjsonCodec() if orjson is not None else JsonCodec()
+
+
+def get_codec():
+    """
+    Get the codec in use, orjson when it is installed and the standard library otherwise.
+    """
+    return _codec
+
+
+def set_codec(codec) -> None:
+    """
+    Set the codec, any object with ``loads(data)`` and ``dumps(obj, default)``
+    methods and a ``serializes_dataclasses`` flag.
+    """
+    global _codec
+    _codec = codec
+
+
+def loads(data: Union[str, bytes]):
+    """
+    Decodes a JSON document with the codec in use.
+
+    Raises:
+        ValueError: If the document is not valid JSON.
+    """
+    return _codec.loads(data)
+
+
+def dumps(obj, default: Optional[Callable] = None) -> str:
+    """
+    Encodes an object as a JSON document with the codec in use.
+    """
+    return _codec.dumps(obj, default)
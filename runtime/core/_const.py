@@ -11,6 +11,10 @@ FILE_MANIFEST: str = 'manifest.json'
 
 PATH_MANIFEST: str = '/__meta__/manifest.json'
 
+PATH_METRICS: str = '/__meta__/metrics'
+
+CONTENT_TYPE_METRICS: str = 'text/plain; version=0.0.4; charset=utf-8'
+
 HTTP_HEADER_SERVER_TIMING: str = 'x-runtime-timing'
 
 HTTP_HEADER_X_RUNTIME_TIMESTAMPS: str = 'x-runtime-timestamps'
@@ -19,18 +23,79 @@ HTTP_HEADER_X_RUNTIME_REQUEST_ID: str = 'x-bizide-request-id'
 
 HTTP_HEADER_X_RUNTIME_EVENT: str = 'x-runtime-event'
 
+HTTP_HEADER_X_RUNTIME_CACHE: str = 'x-runtime-cache'
+
 CTX_KEY_REQUEST_ID: str = 'request_id'
 
 CTX_KEY_RUNTIME_EVENT: str = 'runtime_event'
 
 CTX_KEY_STOPWATCH: str = 'stopwatch'
 
+CTX_KEY_LOG_FRAGMENT: str = 'log_fragment'
+
 MANIFEST_KEY_API: str = 'api'
 
 MANIFEST_KEY_ROUTE: str = 'route'
 
 MANIFEST_KEY_FILE: str = 'file'
 
+MANIFEST_KEY_BATCH: str = 'batch'
+
+MANIFEST_KEY_PRELOAD: str = 'preload'
+
+MANIFEST_KEY_WARMUP: str = 'warmup'
+
+MANIFEST_KEY_ARTIFACTS: str = 'artifacts'
+
+MANIFEST_KEY_CACHE: str = 'cache'
+
+MANIFEST_KEY_CACHE_MAX_ENTRIES: str = 'max_entries'
+
+MANIFEST_KEY_CACHE_MAX_BYTES: str = 'max_bytes'
+
+MANIFEST_KEY_CACHE_TTL_SECONDS: str = 'ttl_seconds'
+
+MANIFEST_KEY_BATCH_MAX_SIZE: str = 'max_size'
+
+MANIFEST_KEY_BATCH_MAX_WAIT_MS: str = 'max_wait_ms'
+
+MODULE_ATTR_HANDLER: str = 'handler'
+
+MODULE_ATTR_BATCH_HANDLER: str = 'batch_handler'
+
+MODULE_ATTR_WARMUP: str = 'warmup'
+
+MODULE_ATTR_INPUT_AS_DICT: str = 'INPUT_AS_DICT'
+
+MODULE_ATTR_INPUT: str = 'Input'
+
+MODULE_ATTR_OUTPUT: str = 'Output'
+
+MODULE_ATTR_CACHE: str = 'CACHE'
+
+PRELOAD_MAX_WORKERS: int = 8
+
+# A route that fails to load is retried after a delay doubling from the base up to the max
+LOAD_RETRY_BASE_SECONDS: float = 1.0
+
+LOAD_RETRY_MAX_SECONDS: float = 60.0
+
+RELOAD_INTERVAL_SECONDS: float = 1.0
+
+# The micro-batcher thread exits after this long without inputs, and starts again on the next one
+BATCH_IDLE_SECONDS: float = 30.0
+
+BATCH_DEFAULT_MAX_SIZE: int = 32
+
+BATCH_DEFAULT_MAX_WAIT_MS: float = 5
+
+# Inputs accepted in one {"inputs": [...]} request
+BATCH_INVOKE_MAX_INPUTS: int = 10000
+
+CACHE_DEFAULT_MAX_ENTRIES: int = 10000
+
+CACHE_DEFAULT_MAX_BYTES: int = 64 * 1024 * 1024
+
 SERVER_TIMING_KEY_FN_LOAD: str = 'fn-load'
 
 SERVER_TIMING_KEY_FN_RUN: str = 'fn-run'
@@ -81,6 +81,20 @@ def get_request_id() -> str:
     return get_ctx_key(_const.CTX_KEY_REQUEST_ID)
 
 
+def set_log_fragment(value: str):
+    """
+    Set the request fields appended to every log line.
+    """
+    add_ctx_key(_const.CTX_KEY_LOG_FRAGMENT, value)
+
+
+def get_log_fragment() -> str:
+    """
+    Get the request fields appended to every log line, empty outside a request.
+    """
+    return get_ctx_key(_const.CTX_KEY_LOG_FRAGMENT) or ''
+
+
 def clear():
     """
     Clear the context variable.
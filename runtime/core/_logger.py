@@ -1,10 +1,15 @@
 """
 This module provides the core runtime for the logger.
 """
+import atexit
 import logging
+import logging.handlers
 import json
+import os
+import queue
+import threading
 from enum import Enum
-from datetime import datetime, timezone
+from typing import List, Optional
 from . import _ctx, _const, _model
 
 TRACE = 0
@@ -60,19 +65,13 @@ class LogFormatter(logging.Formatter):
                 str(max_message_length) + '.'
             record.message = record.message[:max_message_length] + \
                 limit_message
-        message = {
-            'type': self.logger_type.value,
-            'timestamp': int(datetime.now(timezone.utc).timestamp() * 1000),
-            'level': log_level_map.get(record.levelno, 0),
-            'content': record.message
-        }
-        request_id = _ctx.get_request_id()
-        runtime_event = _ctx.get_ctx_key(_const.CTX_KEY_RUNTIME_EVENT)
-        if runtime_event is not None:
-            message.update(runtime_event)
-        if request_id is not None:
-            message.update({'request_id': request_id})
-        record.message = json.dumps(message)
+        # Captured on the request thread by QueueLogHandler.prepare, read from the context otherwise
+        fragment = getattr(record, 'log_fragment', None)
+        if fragment is None:
+            fragment = _ctx.get_log_fragment()
+        record.message = '{"type": %d, "timestamp": %d, "level": %d, "content": %s%s}' % (
+            self.logger_type.value, int(record.created * 1000),
+            log_level_map.get(record.levelno, 0), json.dumps(record.message), fragment)
 
         if self.usesTime():
             record.asctime = self.formatTime(record, self.datefmt)
@@ -99,14 +98,141 @@ vefaas_json_fmt = '%(message)s'
 
 proxy_logger_fmt = '%(message)s'
 
+# The fields every log line has, a runtime event can't replace them
+LOG_LINE_KEYS = frozenset(('type', 'timestamp', 'level', 'content'))
 
-def create_formatter_logger(logger_type: LoggerType, run_type: _model.RunType) -> logging.Logger:
+
+def build_log_fragment(request_id: Optional[str], runtime_event) -> str:
+    """
+    Serialize the request fields appended to every log line of a request.
+
+    Called once per request, so each log line only concatenates the result.
+
+    Args:
+        request_id (str): The request id, None if there is none.
+        runtime_event (dict): The runtime event of the request, None if there is none.
+
+    Returns:
+        str: The fields as a JSON object fragment starting with a comma, empty if there are none.
+    """
+    fields = {}
+    if isinstance(runtime_event, dict):
+        fields.update((key, value) for key, value in runtime_event.items() if key not in LOG_LINE_KEYS)
+    if request_id is not None:
+        fields['request_id'] = request_id
+    if not fields:
+        return ''
+    return ', ' + json.dumps(fields)[1:-1]
+
+
+class QueueLogHandler(logging.handlers.QueueHandler):
+    """
+    Hands log records to a background thread through a bounded queue.
+
+    The calling thread only renders the message and captures the request
+    fields of its runtime context; the JSON formatting and the write are left
+    to the listener thread. When the queue is full the record is dropped and
+    counted instead of blocking the request.
+
+    Attributes:
+        dropped (int): The number of records dropped so far.
+    """
+    dropped: int
+
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        try:
+            record.msg = record.getMessage()
+        except Exception as e:
+            record.msg = '{}'.format(e)
+        record.args = None
+        record.log_fragment = _ctx.get_log_fragment()
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LogPipeline:
+    """
+    The queue and the listener thread writing the records of every runtime logger.
+
+    Each logger's stream handler only takes the records of its logger, so
+    one thread formats and writes for all of them. The listener is started
+    again in a forked child, and drained when the interpreter exits. Drops
+    are reported in the log once the queue has room again.
+    """
+
+    def __init__(self, queue_size: int, stream_handlers: List[logging.Handler]) -> None:
+        self.queue_size = queue_size
+        self.stream_handlers = stream_handlers
+        self.handler = QueueLogHandler(queue.Queue(queue_size))
+        self.reported = 0
+        self.listener = None
+        self._lock = threading.Lock()
+        self.start()
+        atexit.register(self.stop)
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def start(self) -> None:
+        """
+        Starts the listener thread.
+        """
+        self.listener = logging.handlers.QueueListener(self.handler.queue, self, respect_handler_level=False)
+        self.listener.start()
+
+    def stop(self) -> None:
+        """
+        Writes the queued records and stops the listener thread.
+        """
+        with self._lock:
+            if self.listener is not None:
+                self.listener.stop()
+                self.listener = None
+
+    def handle(self, record: logging.LogRecord) -> None:
+        """
+        Writes a record on the listener thread, reporting any drops first.
+        """
+        dropped = self.handler.dropped
+        if dropped != self.reported:
+            self.reported = dropped
+            self._write(logging.makeLogRecord({
+                'name': LoggerType.SYSTEM.name, 'levelno': logging.WARNING, 'levelname': 'WARNING',
+                'msg': f'{dropped} log records dropped in total, the log queue of {self.queue_size} was full',
+                'log_fragment': ''}))
+        self._write(record)
+
+    def _write(self, record: logging.LogRecord) -> None:
+        for handler in self.stream_handlers:
+            if handler.filter(record):
+                handler.handle(record)
+
+    def _after_fork(self) -> None:
+        # The listener thread did not survive the fork and the queue's lock may be held, start afresh
+        if self.listener is None:
+            return
+        self._lock = threading.Lock()
+        self.handler.queue = queue.Queue(self.queue_size)
+        self.start()
+
+
+def create_formatter_logger(logger_type: LoggerType, run_type: _model.RunType,
+                            pipeline: Optional[LogPipeline] = None) -> logging.Logger:
     """
     Create a logger with a JSON formatter.
 
     Args:
         logger_type (LoggerType): The type of logger to create.
         run_type (RunType): The type of run.
+        pipeline (LogPipeline, optional): Write through this pipeline's thread instead of synchronously.
 
     Returns:
         logging.Logger: The logger.
@@ -125,24 +251,67 @@ def create_formatter_logger(logger_type: LoggerType, run_type: _model.RunType) -
         logger.setLevel(logging.INFO)
     handler = logging.StreamHandler()
     handler.setFormatter(LogFormatter(fmt, run_type, logger_type))
-    logger.addHandler(handler)
+    # Initializing again replaces the handlers instead of writing every line twice
+    logger.handlers.clear()
+    if pipeline is None:
+        logger.addHandler(handler)
+    else:
+        handler.addFilter(logging.Filter(logger_type.name))
+        pipeline.stream_handlers.append(handler)
+        logger.addHandler(pipeline.handler)
     return logger
 
 
 sys_logger = None
 user_logger = None
+log_pipeline = None
 
 
-def init_logger(run_type: _model.RunType) -> None:
+def init_logger(run_type: _model.RunType, queue_size: Optional[int] = None) -> None:
     """
     Initialize the logger.
 
     Args:
         run_type (RunType): The type of run.
+        queue_size (int, optional): Write logs on a background thread, buffering up to this many
+            records and dropping records beyond that. Defaults to writing on the calling thread.
+    """
+    global sys_logger, user_logger, log_pipeline
+    if log_pipeline is not None:
+        log_pipeline.stop()
+        log_pipeline = None
+    if queue_size is not None and queue_size > 0:
+        log_pipeline = LogPipeline(queue_size, [])
+    sys_logger = create_formatter_logger(LoggerType.SYSTEM, run_type, log_pipeline)
+    user_logger = create_formatter_logger(LoggerType.USER, run_type, log_pipeline)
+
+
+def shutdown_logger() -> None:
+    """
+    Write the queued log records and flush the runtime loggers.
+
+    The pipeline is drained at interpreter exit anyway, this is for processes
+    that leave through ``os._exit`` and skip the ``atexit`` handlers.
+    """
+    if log_pipeline is not None:
+        log_pipeline.stop()
+    for logger in (sys_logger, user_logger):
+        if logger is not None:
+            for handler in logger.handlers:
+                handler.flush()
+    if log_pipeline is not None:
+        for handler in log_pipeline.stream_handlers:
+            handler.flush()
+
+
+def get_dropped_logs() -> int:
+    """
+    Get the number of log records dropped because the log queue was full.
+
+    Returns:
+        int: The number of dropped records, 0 when logging synchronously.
     """
-    global sys_logger, user_logger
-    sys_logger = create_formatter_logger(LoggerType.SYSTEM, run_type)
-    user_logger = create_formatter_logger(LoggerType.USER, run_type)
+    return log_pipeline.handler.dropped if log_pipeline is not None else 0
 
 
 def get_sys_logger() -> logging.Logger:
@@ -0,0 +1,170 @@
+"""
+This module provides the core runtime per-route metrics.
+"""
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Optional
+
+from . import _const
+from ._logger import get_dropped_logs
+
+# Upper bounds of the latency histogram buckets in nanoseconds, the last bucket is +Inf
+BUCKET_BOUNDS_NS: List[int] = [int(ms * 1_000_000) for ms in
+                               (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)]
+
+PHASES = (_const.SERVER_TIMING_KEY_FN_LOAD, _const.SERVER_TIMING_KEY_FN_RUN, _const.SERVER_TIMING_KEY_FN_TOTAL)
+
+
+class RouteShard:
+    """
+    The metrics of one route recorded by one thread.
+
+    Only the owning thread writes to a shard, so recording takes no lock.
+    Readers add the shards of every thread up and may see a request's
+    durations before its error.
+
+    Attributes:
+        buckets (dict): Per phase, the request count of each bucket, not cumulative.
+        sums (dict): Per phase, the total duration in nanoseconds.
+        errors (dict): The error count per error code.
+    """
+    __slots__ = ('buckets', 'sums', 'errors')
+
+    def __init__(self) -> None:
+        self.buckets = {phase: [0] * (len(BUCKET_BOUNDS_NS) + 1) for phase in PHASES}
+        self.sums = {phase: 0 for phase in PHASES}
+        self.errors = {}
+
+
+class Metrics:
+    """
+    Per-route latency histograms and error counters, sharded per thread.
+    """
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        # Every thread's route shards, the lock only guards adding a thread
+        self._shards: List[Dict[str, RouteShard]] = []
+        self._lock = threading.Lock()
+
+    def record(self, route: str, durations: Dict[str, int], error_code: Optional[str] = None) -> None:
+        """
+        Records a request.
+
+        Args:
+            route (str): The route of the request.
+            durations (dict): The duration of each phase the request went through, in nanoseconds.
+            error_code (str, optional): The code of the error the request was answered with.
+        """
+        try:
+            shards = self._local.shards
+        except AttributeError:
+            shards = self._local.shards = {}
+            with self._lock:
+                self._shards.append(shards)
+        shard = shards.get(route)
+        if shard is None:
+            shard = shards[route] = RouteShard()
+        for phase, duration in durations.items():
+            shard.buckets[phase][bisect_left(BUCKET_BOUNDS_NS, duration)] += 1
+            shard.sums[phase] += duration
+        if error_code is not None:
+            shard.errors[error_code] = shard.errors.get(error_code, 0) + 1
+
+    def render(self) -> str:
+        """
+        Renders the metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: The metrics document.
+        """
+        with self._lock:
+            shards = list(self._shards)
+        routes: Dict[str, RouteShard] = {}
+        for thread_shards in shards:
+            for route, shard in list(thread_shards.items()):
+                total = routes.get(route)
+                if total is None:
+                    total = routes[route] = RouteShard()
+                for phase in PHASES:
+                    total.buckets[phase] = [a + b for a, b in zip(total.buckets[phase], shard.buckets[phase])]
+                    total.sums[phase] += shard.sums[phase]
+                for code, count in list(shard.errors.items()):
+                    total.errors[code] = total.errors.get(code, 0) + count
+
+        lines = ['# HELP runtime_fn_duration_seconds Time spent per request phase: '
+                 'fn-load, fn-run and fn-total.',
+                 '# TYPE runtime_fn_duration_seconds histogram']
+        for route, total in sorted(routes.items()):
+            for phase in PHASES:
+                labels = f'route="{escape_label(route)}",phase="{phase}"'
+                count = 0
+                for bound, bucket in zip(BUCKET_BOUNDS_NS, total.buckets[phase]):
+                    count += bucket
+                    lines.append(f'runtime_fn_duration_seconds_bucket{{{labels},le="{bound / 1e9:g}"}} {count}')
+                count += total.buckets[phase][-1]
+                lines.append(f'runtime_fn_duration_seconds_bucket{{{labels},le="+Inf"}} {count}')
+                lines.append(f'runtime_fn_duration_seconds_sum{{{labels}}} {total.sums[phase] / 1e9:.9g}')
+                lines.append(f'runtime_fn_duration_seconds_count{{{labels}}} {count}')
+
+        lines.append('# HELP runtime_fn_errors_total Requests answered with an error, per error code.')
+        lines.append('# TYPE runtime_fn_errors_total counter')
+        for route, total in sorted(routes.items()):
+            for code, count in sorted(total.errors.items()):
+                lines.append(f'runtime_fn_errors_total{{route="{escape_label(route)}",'
+                             f'code="{escape_label(code)}"}} {count}')
+
+        lines.append('# HELP runtime_log_records_dropped_total Log records dropped because the log queue was full.')
+        lines.append('# TYPE runtime_log_records_dropped_total counter')
+        lines.append(f'runtime_log_records_dropped_total {get_dropped_logs()}')
+        return '\n'.join(lines) + '\n'
+
+
+def render_caches(caches: List[tuple]) -> str:
+    """
+    Renders the counters of response caches in the Prometheus text exposition format.
+
+    Args:
+        caches (list): The (route, ResponseCache) pairs to render.
+
+    Returns:
+        str: The metrics document, empty without caches.
+    """
+    if not caches:
+        return ''
+    lines = []
+    for name, help_text, kind, attr in (
+            ('runtime_cache_hits_total', 'Response cache lookups that found a response.', 'counter', 'hits'),
+            ('runtime_cache_misses_total', 'Response cache lookups that did not.', 'counter', 'misses'),
+            ('runtime_cache_entries', 'Responses in the cache.', 'gauge', None),
+            ('runtime_cache_bytes', 'Approximate size of the responses in the cache.', 'gauge', 'size')):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        for route, cache in caches:
+            value = len(cache) if attr is None else getattr(cache, attr)
+            lines.append(f'{name}{{route="{escape_label(route)}"}} {value}')
+    return '\n'.join(lines) + '\n'
+
+
+def escape_label(value: str) -> str:
+    """
+    Escapes a Prometheus label value.
+    """
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+metrics = Metrics()
+
+
+def record(route: str, durations: Dict[str, int], error_code: Optional[str] = None) -> None:
+    """
+    Records a request in the runtime metrics.
+    """
+    metrics.record(route, durations, error_code)
+
+
+def render() -> str:
+    """
+    Renders the runtime metrics in the Prometheus text exposition format.
+    """
+    return metrics.render()
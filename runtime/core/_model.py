@@ -6,6 +6,7 @@ from enum import Enum
 from dataclasses import dataclass
 from logging import Logger
 from typing import Optional
+from . import _codec
 from ._exception import BaseError
 
 
@@ -99,7 +100,7 @@ class ResponseBody:
 
     Attributes:
         success (bool): Indicates if the function or method was successful.
-        data (any): The data returned by the function or method.
+        data (str): The data returned by the function or method, already encoded as JSON.
         code (str): The code associated with the response.
         message (str): The message associated with the response.
     """
@@ -124,15 +125,11 @@ class ResponseBody:
         Returns:
             str: The JSON string representation of the response body.
         """
-        resp = {}
         if self.code != None and self.code != '':
-            resp['code'] = self.code
-            resp['message'] = self.message
+            return _codec.dumps({'code': self.code, 'message': self.message})
 
-        else:
-            resp['data'] = self.data
-
-        return json.dumps(resp)
+        # data is already JSON, embed it as is instead of encoding it again as a string
+        return '{"data":' + (self.data if self.data is not None else 'null') + '}'
 
 
 class RunType(Enum):
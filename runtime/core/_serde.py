@@ -0,0 +1,64 @@
+"""
+This module provides the core runtime typed conversion of handler input and output.
+"""
+from typing import Any, Callable, Optional
+
+from . import _exception
+from ._logger import get_sys_logger
+
+try:
+    import apischema
+except ImportError:
+    apischema = None
+
+
+def build_serializer(output_type: Any) -> Optional[Callable[[Any], Any]]:
+    """
+    Compiles a serializer from a handler's declared output type.
+
+    Args:
+        output_type (type): The ``Output`` type of the handler module.
+
+    Returns:
+        Callable: Converts an instance of the type to JSON-compatible values,
+            None if apischema is not installed or can't handle the type.
+    """
+    if apischema is None or not isinstance(output_type, type):
+        return None
+    try:
+        return apischema.serialization_method(output_type, check_type=False)
+    except Exception as e:
+        get_sys_logger().warning('can not compile serializer for %s: %s', output_type, e)
+        return None
+
+
+def build_deserializer(input_type: Any) -> Optional[Callable[[Any], Any]]:
+    """
+    Compiles a validating deserializer from a handler's declared input type.
+
+    Properties the type does not declare are allowed and ignored.
+
+    Args:
+        input_type (type): The ``Input`` type of the handler module.
+
+    Returns:
+        Callable: Converts decoded JSON to an instance of the type, raising
+            RequestInvalidBodyError if it does not match. None if apischema
+            is not installed or can't handle the type.
+    """
+    if apischema is None or not isinstance(input_type, type):
+        return None
+    try:
+        method = apischema.deserialization_method(input_type, additional_properties=True, no_copy=True)
+    except Exception as e:
+        get_sys_logger().warning('can not compile deserializer for %s: %s', input_type, e)
+        return None
+
+    def deserialize(data):
+        try:
+            return method(data)
+        except apischema.ValidationError as e:
+            errors = '; '.join(f"{'.'.join(map(str, error['loc'])) or 'input'}: {error['err']}"
+                               for error in e.errors)
+            raise _exception.RequestInvalidBodyError(f'invalid input: {errors}') from None
+    return deserialize
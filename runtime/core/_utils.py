@@ -1,12 +1,14 @@
 """
 This module provides the core runtime for the utils.
 """
+import os
 import time
 import traceback
 import sys
 import importlib.util
 from re import sub
 from types import SimpleNamespace
+from typing import Optional
 from . import _const
 
 FUNCTIONS_DIR_PATH = ''
@@ -62,6 +64,23 @@ def time_delta_milliseconds(end_time, start_time):
     return int((end_time - start_time) * 1000)
 
 
+def file_version(path: str):
+    """
+    Get the version of a file, for detecting changes by polling.
+
+    Args:
+        path (str): The file path.
+
+    Returns:
+        tuple: The modification time in nanoseconds and the size, None if the file is missing.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
 class Stopwatch:
     """
     A class for measuring the time elapsed between different events in a program.
@@ -75,6 +94,8 @@ class Stopwatch:
     fn_run_start_time: int
     server_timing: dict
     x_runtime_timestamps: dict
+    durations: dict
+    cache: Optional[str]
 
     @staticmethod
     def project_init_start():
@@ -93,6 +114,10 @@ class Stopwatch:
     def __init__(self) -> None:
         self.server_timing = {}
         self.x_runtime_timestamps = {}
+        # The same durations as server_timing, in nanoseconds
+        self.durations = {}
+        # The response cache lookup and counters of the route, None if it has no cache
+        self.cache = None
         self.fn_start_time = time.time_ns()
         self.x_runtime_timestamps[_const.SERVER_TIMESTAMPS_KEY_REQUEST] = int(
             time.time_ns() / 1_000_000)
@@ -108,6 +133,7 @@ class Stopwatch:
         End the function loading time.
         """
         fn_load = time.time_ns() - self.fn_load_start_time
+        self.durations[_const.SERVER_TIMING_KEY_FN_LOAD] = fn_load
         self.server_timing[_const.SERVER_TIMING_KEY_FN_LOAD] = int(
             fn_load / 1_000_000)
 
@@ -124,6 +150,7 @@ class Stopwatch:
         End the function execution time.
         """
         fn_run = time.time_ns() - self.fn_run_start_time
+        self.durations[_const.SERVER_TIMING_KEY_FN_RUN] = fn_run
         self.server_timing[_const.SERVER_TIMING_KEY_FN_RUN] = int(
             fn_run / 1_000_000)
         self.x_runtime_timestamps[_const.SERVER_TIMESTAMPS_KEY_USER_END] = int(
@@ -134,6 +161,7 @@ class Stopwatch:
         End the function execution time.
         """
         fn_total = time.time_ns() - self.fn_start_time
+        self.durations[_const.SERVER_TIMING_KEY_FN_TOTAL] = fn_total
         self.server_timing[_const.SERVER_TIMING_KEY_FN_TOTAL] = int(
             fn_total / 1_000_000)
         self.x_runtime_timestamps[_const.SERVER_TIMESTAMPS_KEY_RESPONSE] = int(
@@ -158,6 +186,8 @@ class Stopwatch:
             [f'{key};dur={value}' for key, value in self.server_timing.items()])
         headers[_const.HTTP_HEADER_X_RUNTIME_TIMESTAMPS] = ', '.join(
             [f'{key}={value}' for key, value in self.x_runtime_timestamps.items()])
+        if self.cache is not None:
+            headers[_const.HTTP_HEADER_X_RUNTIME_CACHE] = self.cache
         return headers
 
 
@@ -213,6 +243,174 @@ def dict_to_namespace(d):
     else:
         return d
 
+
+class LazyNamespace:
+    """
+    An attribute view of a decoded JSON object that converts nested values on access.
+
+    Reading an attribute returns the value under that key, or None when the
+    key is missing like ``CustomNamespace``. A nested dict or list is
+    wrapped when it is first read and the wrapper replaces it in the
+    underlying dict, so it is converted only once and only if it is used.
+
+    Attributes:
+        __dict__ (dict): The underlying dict, updated by setting attributes.
+    """
+    __slots__ = ('_data',)
+
+    def __init__(self, data: dict) -> None:
+        object.__setattr__(self, '_data', data)
+
+    def __getattr__(self, name):
+        if name == '_data':
+            raise AttributeError(name)
+        data = self._data
+        value = data.get(name)
+        if value is None:
+            if name[:2] == '__':
+                # Keep protocol lookups such as __array_interface__ failing
+                raise AttributeError(name)
+            return None
+        kind = type(value)
+        if kind is dict:
+            value = data[name] = LazyNamespace(value)
+        elif kind is list:
+            value = data[name] = LazyList(value)
+        return value
+
+    def __setattr__(self, name, value) -> None:
+        self._data[name] = value
+
+    def __delattr__(self, name) -> None:
+        try:
+            del self._data[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    @property
+    def __dict__(self) -> dict:
+        return self._data
+
+    def __dir__(self):
+        return list(self._data)
+
+    def __reduce__(self):
+        return LazyNamespace, (self._data,)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (LazyNamespace, SimpleNamespace)):
+            return self._data == vars(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        items = ', '.join(f'{key}={value!r}' for key, value in self._data.items())
+        return f'namespace({items})'
+
+
+class LazyList(list):
+    """
+    A list of decoded JSON values that wraps nested dicts and lists on access.
+
+    Items read by index, slice or iteration are converted like
+    ``LazyNamespace`` attributes and stored back in the list. The other list
+    methods that return or compare items convert every item first, so they
+    behave as on the list ``dict_to_namespace`` would build. Their results
+    are plain lists.
+    """
+    __slots__ = ()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return self._convert(index, list.__getitem__(self, index))
+
+    def __iter__(self):
+        get = list.__getitem__
+        for index in range(len(self)):
+            value = get(self, index)
+            kind = type(value)
+            yield self._convert(index, value) if kind is dict or kind is list else value
+
+    def __reversed__(self):
+        get = list.__getitem__
+        for index in range(len(self) - 1, -1, -1):
+            yield self._convert(index, get(self, index))
+
+    def __contains__(self, value) -> bool:
+        return list.__contains__(self._convert_all(), value)
+
+    def __add__(self, other):
+        if isinstance(other, LazyList):
+            other._convert_all()
+        return list.__add__(self._convert_all(), other)
+
+    def __radd__(self, other):
+        if not isinstance(other, list):
+            return NotImplemented
+        return list.__add__(other, self._convert_all())
+
+    def __mul__(self, count):
+        return list.__mul__(self._convert_all(), count)
+
+    __rmul__ = __mul__
+
+    def copy(self):
+        return list.copy(self._convert_all())
+
+    def index(self, value, *args) -> int:
+        return list.index(self._convert_all(), value, *args)
+
+    def count(self, value) -> int:
+        return list.count(self._convert_all(), value)
+
+    def remove(self, value) -> None:
+        list.remove(self._convert_all(), value)
+
+    def pop(self, index=-1):
+        return lazy_namespace(list.pop(self, index))
+
+    def sort(self, *, key=None, reverse=False) -> None:
+        list.sort(self._convert_all(), key=key, reverse=reverse)
+
+    def _convert_all(self) -> 'LazyList':
+        get = list.__getitem__
+        for index in range(len(self)):
+            value = get(self, index)
+            kind = type(value)
+            if kind is dict or kind is list:
+                self._convert(index, value)
+        return self
+
+    def _convert(self, index, value):
+        kind = type(value)
+        if kind is dict:
+            value = LazyNamespace(value)
+            list.__setitem__(self, index, value)
+        elif kind is list:
+            value = LazyList(value)
+            list.__setitem__(self, index, value)
+        return value
+
+
+def lazy_namespace(value):
+    """
+    Wrap a decoded JSON value for attribute access, converting nested values on access.
+
+    Args:
+        value (any): The decoded value.
+
+    Returns:
+        any: A LazyNamespace for a dict, a LazyList for a list, the value itself otherwise.
+    """
+    if type(value) is dict:
+        return LazyNamespace(value)
+    if type(value) is list:
+        return LazyList(value)
+    return value
+
+
 def import_module_from_file(module_name, file_path):
     spec = importlib.util.spec_from_file_location(module_name, file_path)
     if (spec is None or spec.loader is None):
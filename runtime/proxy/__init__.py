@@ -1,4 +1,4 @@
 """
 Proxy for running Python functions.
 """
-from .proxy import run
+from .proxy import run, DEFAULT_QUEUE_SIZE, DEFAULT_LOG_QUEUE_SIZE
@@ -0,0 +1,185 @@
+"""Module providing the asyncio proxy server"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import urllib.parse
+
+import runtime.core as runtime
+
+# Limits of the request line and of each header line
+MAX_LINE_BYTES = 65536
+
+MAX_HEADERS = 100
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           500: 'Internal Server Error'}
+
+
+class BadRequest(Exception):
+    """
+    Raised for a request that can't be parsed, the connection is closed after answering it.
+    """
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+async def read_request(reader: asyncio.StreamReader):
+    """
+    Reads one HTTP/1.x request from the connection.
+
+    Args:
+        reader (asyncio.StreamReader): The connection reader.
+
+    Returns:
+        tuple: The method, target, headers, body and keep-alive flag, None if the client closed the connection.
+    """
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    parts = request_line.decode('latin-1').rstrip('\r\n').split(' ')
+    if len(parts) != 3 or not parts[2].startswith('HTTP/1.'):
+        raise BadRequest(400, 'Bad request line')
+    method, target, version = parts
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        if len(headers) >= MAX_HEADERS:
+            raise BadRequest(400, 'Too many headers')
+        name, sep, value = line.decode('latin-1').partition(':')
+        if not sep:
+            raise BadRequest(400, 'Bad header line')
+        headers[name.strip()] = value.strip()
+
+    lower = {name.lower(): value for name, value in headers.items()}
+    if 'chunked' in lower.get('transfer-encoding', '').lower():
+        raise BadRequest(400, 'Chunked request bodies are not supported')
+    try:
+        length = int(lower.get('content-length', 0))
+    except ValueError:
+        raise BadRequest(400, 'Bad Content-Length')
+    body = await reader.readexactly(length) if length > 0 else b''
+
+    connection = lower.get('connection', '').lower()
+    if version == 'HTTP/1.1':
+        keep_alive = connection != 'close'
+    else:
+        keep_alive = connection == 'keep-alive'
+    return method, target, headers, body, keep_alive
+
+
+def write_response(writer: asyncio.StreamWriter, status: int, headers: dict, body: bytes,
+                   keep_alive: bool) -> None:
+    """
+    Writes an HTTP/1.1 response as a single buffer.
+
+    Args:
+        writer (asyncio.StreamWriter): The connection writer.
+        status (int): The status code.
+        headers (dict): The response headers.
+        body (bytes): The response body.
+        keep_alive (bool): Whether the connection stays open for the next request.
+    """
+    lines = [f'HTTP/1.1 {status} {REASONS.get(status, "")}']
+    for name, value in headers.items():
+        lines.append(f'{name}: {value}')
+    lines.append(f'Content-Length: {len(body)}')
+    lines.append('Connection: keep-alive' if keep_alive else 'Connection: close')
+    writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+
+
+async def dispatch(app: runtime.App, method: str, target: str, headers: dict, body: bytes):
+    """
+    Routes a request to the app.
+
+    Returns:
+        tuple: The status code, response headers and response body.
+    """
+    url = urllib.parse.urlparse(target).path
+    if url == '/manifest.json' and method in ('GET', 'POST'):
+        return 200, {'Content-Type': 'application/json'}, app.manifest_content.encode('utf-8')
+    if url == runtime.PATH_METRICS and method == 'GET':
+        return 200, {'Content-Type': runtime.CONTENT_TYPE_METRICS}, app.metrics().encode('utf-8')
+    if method == 'GET':
+        return 404, {'Content-Type': 'text/plain'}, b'Not found'
+    if method != 'POST':
+        return 405, {'Content-Type': 'text/plain'}, b'Method not allowed'
+    invoke_request = runtime.InvokeRequest(version=1,
+                                           protocol='HTTP',
+                                           method='POST',
+                                           url=url,
+                                           headers=headers,
+                                           body=body.decode('utf-8'),
+                                           is_base64_encoded=False)
+    invoke_response = await app.entry_handler_async(invoke_request)
+    response_headers = dict(invoke_response.headers or {})
+    return invoke_response.status_code, response_headers, invoke_response.body.encode('utf-8')
+
+
+async def serve_async(app: runtime.App, host: str, port: int, threads: int = None) -> None:
+    """
+    Serve the app on an asyncio event loop.
+
+    Each connection is handled by its own task and kept alive between
+    requests. Coroutine handlers run on the loop, so one process can hold
+    many thousands of concurrent I/O-bound invocations. Sync handlers and
+    route loading run on the loop's default executor.
+
+    Args:
+        app (App): The initialized app.
+        host (str): The host to bind to.
+        port (int): The port to bind to.
+        threads (int, optional): The size of the executor for sync handlers. Defaults to asyncio's default.
+    """
+    loop = asyncio.get_running_loop()
+    if threads is not None and threads > 0:
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=threads, thread_name_prefix='proxy-worker'))
+
+    async def handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except BadRequest as e:
+                    write_response(writer, e.status, {'Content-Type': 'text/plain'},
+                                   str(e).encode('utf-8'), keep_alive=False)
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                method, target, headers, body, keep_alive = request
+                status, response_headers, response_body = await dispatch(app, method, target, headers, body)
+                write_response(writer, status, response_headers, response_body, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            # The client went away mid-request, or sent an oversized line
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle_connection, host, port, limit=MAX_LINE_BYTES,
+                                        backlog=1024)
+    print(f'Server started on {host}:{port} (asyncio)')
+    async with server:
+        await server.serve_forever()
+
+
+def run_async(app: runtime.App, host: str, port: int, threads: int = None) -> None:
+    """
+    Run the asyncio server until Ctrl+C.
+
+    Args:
+        app (App): The initialized app.
+        host (str): The host to bind to.
+        port (int): The port to bind to.
+        threads (int, optional): The size of the executor for sync handlers.
+    """
+    try:
+        asyncio.run(serve_async(app, host, port, threads))
+    except KeyboardInterrupt:
+        print("Server stopped")
@@ -2,14 +2,381 @@
 import os
 
 from http.server import BaseHTTPRequestHandler, HTTPServer
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+import gc
+import selectors
+import signal
+import socket
+import threading
+import time
 import urllib.parse
 import json
 import runtime.core as runtime
 import sys
 import site
 
+from collections import OrderedDict
 
-def run(name: str, host: str = '', port: int = 3000, root=None, logFormat='normal'):
+from .async_proxy import run_async
+
+DEFAULT_QUEUE_SIZE = 64
+
+# Log records buffered for the logging thread, 0 logs on the request threads
+DEFAULT_LOG_QUEUE_SIZE = 10000
+
+# An idle keep-alive connection is closed after this long
+KEEP_ALIVE_TIMEOUT_SECONDS = 5
+
+# The request body buffer every connection starts with, and the most it is grown to
+BODY_BUFFER_BYTES = 16 * 1024
+
+BODY_BUFFER_MAX_BYTES = 1024 * 1024
+
+# A worker that dies sooner than this after starting is restarted with a delay
+WORKER_MIN_UPTIME_SECONDS = 1.0
+
+SERVICE_UNAVAILABLE_RESPONSE = (b'HTTP/1.1 503 Service Unavailable\r\n'
+                                b'Content-Type: text/plain\r\n'
+                                b'Content-Length: 19\r\n'
+                                b'Connection: close\r\n\r\n'
+                                b'Service Unavailable')
+
+
+class IdleConnections:
+    """
+    Kept-alive connections waiting for their next request, watched by one thread.
+
+    A parked connection holds neither a pool thread nor a slot. Once it is
+    readable it is handed back to the server, and one left idle for
+    ``timeout`` seconds is closed. Connections are parked from the pool
+    threads, so they are queued and the watching thread, woken through a
+    socket pair, is the only one touching the selector.
+    """
+
+    def __init__(self, server, timeout: float) -> None:
+        self.server = server
+        self.timeout = timeout
+        # Handlers by the time they were parked, oldest first
+        self.parked = OrderedDict()
+        self.incoming = []
+        self.closed = False
+        self.selector = None
+        self.thread = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """
+        Starts the watching thread, in the process that serves.
+        """
+        self.selector = selectors.DefaultSelector()
+        self._wake_reader, self._wake_writer = socket.socketpair()
+        self._wake_reader.setblocking(False)
+        self._wake_writer.setblocking(False)
+        self.selector.register(self._wake_reader, selectors.EVENT_READ)
+        self.thread = threading.Thread(target=self.run, name='proxy-idle', daemon=True)
+        self.thread.start()
+
+    def park(self, handler) -> bool:
+        """
+        Parks a connection until its next request arrives.
+
+        Returns:
+            bool: False if the server is closing and the connection should be closed instead.
+        """
+        with self._lock:
+            if self.closed or self.thread is None:
+                return False
+            self.incoming.append(handler)
+        self._wake()
+        return True
+
+    def close(self) -> None:
+        """
+        Stops the watching thread and closes every parked connection.
+        """
+        with self._lock:
+            self.closed = True
+        if self.thread is None:
+            return
+        self._wake()
+        self.thread.join()
+        with self._lock:
+            handlers = list(self.parked) + self.incoming
+            self.parked.clear()
+            self.incoming = []
+        for handler in handlers:
+            self.server.close_connection(handler)
+        self.selector.close()
+        self._wake_reader.close()
+        self._wake_writer.close()
+
+    def _wake(self) -> None:
+        try:
+            self._wake_writer.send(b'\0')
+        except OSError:
+            # The pair's buffer is full, the thread is woken already
+            pass
+
+    def run(self) -> None:
+        while True:
+            with self._lock:
+                if self.closed:
+                    return
+                incoming, self.incoming = self.incoming, []
+            now = time.monotonic()
+            for handler in incoming:
+                try:
+                    self.selector.register(handler.request, selectors.EVENT_READ, handler)
+                except (OSError, ValueError):
+                    self.server.close_connection(handler)
+                    continue
+                self.parked[handler] = now
+            # The oldest connection is the next to time out
+            wait = None
+            if self.parked:
+                wait = max(0.0, next(iter(self.parked.values())) + self.timeout - now)
+            for key, _ in self.selector.select(wait):
+                if key.data is None:
+                    try:
+                        while self._wake_reader.recv(4096):
+                            pass
+                    except OSError:
+                        pass
+                    continue
+                self.selector.unregister(key.fileobj)
+                del self.parked[key.data]
+                self.server.resume_connection(key.data)
+            deadline = time.monotonic() - self.timeout
+            while self.parked:
+                handler, parked_at = next(iter(self.parked.items()))
+                if parked_at > deadline:
+                    break
+                del self.parked[handler]
+                self.selector.unregister(handler.request)
+                self.server.close_connection(handler)
+
+
+class PooledHTTPServer(HTTPServer):
+    """
+    An HTTP server that handles requests on a bounded thread pool.
+
+    Every request is handed to one of ``pool_size`` worker threads. At most
+    ``queue_size`` more requests wait for a free worker; any request beyond
+    that is answered with 503 straight away instead of piling up. A thread
+    handles one request at a time: between requests a kept-alive connection
+    is parked in ``IdleConnections`` and only comes back to the pool once
+    its next request arrives, so idle clients never hold a thread. Every
+    request runs in a fresh ``contextvars.Context`` so the runtime context
+    of one request never leaks into another on the same thread.
+    """
+    request_queue_size = 128
+
+    def __init__(self, server_address, handler_class, pool_size: int, queue_size: int = DEFAULT_QUEUE_SIZE,
+                 keep_alive_timeout: float = KEEP_ALIVE_TIMEOUT_SECONDS):
+        super().__init__(server_address, handler_class)
+        self.executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix='proxy-worker')
+        self.slots = threading.BoundedSemaphore(pool_size + max(0, queue_size))
+        self.idle = IdleConnections(self, keep_alive_timeout)
+
+    def serve_forever(self, poll_interval=0.5):
+        # Started here rather than in __init__, so each pre-forked worker has its own thread
+        self.idle.start()
+        super().serve_forever(poll_interval)
+
+    def process_request(self, request, client_address):
+        handler = self.RequestHandlerClass.__new__(self.RequestHandlerClass)
+        handler.request, handler.client_address, handler.server = request, client_address, self
+        try:
+            handler.setup()
+        except Exception:
+            self.handle_error(request, client_address)
+            self.shutdown_request(request)
+            return
+        self.resume_connection(handler)
+
+    def resume_connection(self, handler):
+        """
+        Hands a connection whose next request has arrived to the pool, or answers 503 if it is full.
+        """
+        if not self.slots.acquire(blocking=False):
+            self.reject_request(handler.request)
+            self.close_connection(handler)
+            return
+        try:
+            self.executor.submit(contextvars.Context().run, self.process_request_thread, handler)
+        except RuntimeError:
+            # The executor is shutting down
+            self.slots.release()
+            self.close_connection(handler)
+
+    def process_request_thread(self, handler):
+        keep_alive = False
+        try:
+            handler.close_connection = True
+            handler.handle_one_request()
+            keep_alive = not handler.close_connection
+        except Exception:
+            self.handle_error(handler.request, handler.client_address)
+        finally:
+            self.slots.release()
+        if not keep_alive:
+            self.close_connection(handler)
+        elif self.has_pending_request(handler):
+            # Pipelined, or already sent: the selector would not see bytes the handler buffered
+            self.resume_connection(handler)
+        elif not self.idle.park(handler):
+            self.close_connection(handler)
+
+    def has_pending_request(self, handler) -> bool:
+        """
+        Tells whether the connection's next request has started arriving, without blocking.
+        """
+        sock = handler.request
+        try:
+            sock.settimeout(0)
+            return bool(handler.rfile.peek(1))
+        except OSError:
+            return False
+        finally:
+            try:
+                sock.settimeout(handler.timeout)
+            except OSError:
+                pass
+
+    def close_connection(self, handler):
+        try:
+            handler.finish()
+        except Exception:
+            pass
+        self.shutdown_request(handler.request)
+
+    def reject_request(self, request):
+        try:
+            # Drain what already arrived so closing does not reset the connection
+            request.setblocking(False)
+            request.recv(65536)
+        except OSError:
+            pass
+        try:
+            request.setblocking(True)
+            request.sendall(SERVICE_UNAVAILABLE_RESPONSE)
+        except OSError:
+            pass
+
+    def server_close(self):
+        super().server_close()
+        # Requests still running close their connection instead of parking it
+        self.idle.close()
+        self.executor.shutdown(wait=True)
+
+
+def send_buffers(sock, buffers) -> None:
+    """
+    Sends buffers on a socket with as few system calls as it takes, without joining them.
+
+    Args:
+        sock (socket.socket): The connected socket.
+        buffers (list): The bytes-like objects to send, in order.
+    """
+    if not hasattr(sock, 'sendmsg'):
+        sock.sendall(b''.join(buffers))
+        return
+    views = [memoryview(buffer) for buffer in buffers if len(buffer)]
+    while views:
+        sent = sock.sendmsg(views)
+        # Drop what was sent, the kernel may have taken only part of the buffers
+        while sent:
+            if sent >= len(views[0]):
+                sent -= len(views.pop(0))
+            else:
+                views[0] = views[0][sent:]
+                sent = 0
+
+
+def serve_prefork(httpd: HTTPServer, workers: int) -> None:
+    """
+    Serve on ``workers`` forked processes that share the listening socket.
+
+    Everything loaded before the fork, such as preloaded route modules and
+    their models, is shared copy-on-write by all workers. The master process
+    restarts workers that exit unexpectedly. On SIGTERM or Ctrl+C it asks
+    every worker to stop accepting connections, lets in-flight requests
+    finish and waits for them to exit.
+
+    Args:
+        httpd (HTTPServer): The bound server, not serving yet.
+        workers (int): The number of worker processes.
+    """
+    if not hasattr(os, 'fork'):
+        raise RuntimeError('pre-fork workers are not supported on this platform')
+
+    children = {}
+    stopping = False
+
+    def stop_worker(signum, frame):
+        # shutdown() blocks until serve_forever returns, so it can't run on the serving thread
+        threading.Thread(target=httpd.shutdown, daemon=True).start()
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGTERM, stop_worker)
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            code = 0
+            try:
+                httpd.serve_forever()
+            except BaseException:
+                code = 1
+            finally:
+                httpd.server_close()
+                # os._exit skips atexit, write the logs of the last requests first
+                runtime.shutdown_logger()
+                os._exit(code)
+        children[pid] = time.monotonic()
+
+    def stop_master(signum, frame):
+        nonlocal stopping
+        if stopping:
+            return
+        stopping = True
+        print("Server stopping")
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    # Keep the objects loaded so far out of the collector, so it doesn't
+    # touch and copy their pages in every worker
+    gc.freeze()
+    signal.signal(signal.SIGTERM, stop_master)
+    signal.signal(signal.SIGINT, stop_master)
+    for _ in range(workers):
+        spawn()
+    print(f'Server started with {workers} workers')
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        started = children.pop(pid, None)
+        if started is None or stopping:
+            continue
+        print(f'Worker {pid} exited with status {os.waitstatus_to_exitcode(status)}, restarting')
+        if time.monotonic() - started < WORKER_MIN_UPTIME_SECONDS:
+            time.sleep(WORKER_MIN_UPTIME_SECONDS)
+        if not stopping:
+            spawn()
+    httpd.server_close()
+    print("Server stopped")
+
+
+def run(name: str, host: str = '', port: int = 3000, root=None, logFormat='normal',
+        threads: int = None, queue_size: int = DEFAULT_QUEUE_SIZE, workers: int = None,
+        preload: bool = False, use_async: bool = False, reload: bool = False,
+        log_queue_size: int = DEFAULT_LOG_QUEUE_SIZE):
     """
         Run the application with the specified name on the specified host and port.
 
@@ -17,6 +384,13 @@ def run(name: str, host: str = '', port: int = 3000, root=None, logFormat='norma
             name (str): The name of the application to run.
             host (str, optional): The host IP address or hostname to bind the application to. Defaults to None.
             port (int, optional): The port number to bind the application to. Defaults to None.
+            threads (int, optional): Handle requests on a pool of this many threads. Defaults to one request at a time.
+            queue_size (int, optional): Connections allowed to wait for a free thread before answering 503.
+            workers (int, optional): Serve on this many forked worker processes. Defaults to a single process.
+            preload (bool, optional): Load and warm up every route in the manifest before serving.
+            use_async (bool, optional): Serve on an asyncio event loop, threads then sizes the executor for sync handlers.
+            reload (bool, optional): Reload routes when the manifest, their files or their artifacts change.
+            log_queue_size (int, optional): Log records buffered for the logging thread, beyond that they are dropped. 0 logs synchronously.
 
         Returns:
             None
@@ -40,19 +414,94 @@ def run(name: str, host: str = '', port: int = 3000, root=None, logFormat='norma
     if logFormat == 'json':
         runType = runtime.RunType.AWS
 
-    app = runtime.App(project_dir, runType)
+    app = runtime.App(project_dir, runType, preload=preload, log_queue_size=log_queue_size)
     app.init_project()
+    if reload:
+        app.watch()
+    if use_async:
+        run_async(app, host, port, threads)
+        return
 
     class ProxyRequestHandler(BaseHTTPRequestHandler):
         """
         A class representing a proxy request handler.
 
         This class inherits from BaseHTTPRequestHandler and overrides the do_POST and do_GET methods to handle HTTP POST and GET requests respectively.
+        Every response has a Content-Length, so with a thread pool the connections are kept alive over HTTP/1.1.
         """
+        # Bounds the wait for the rest of a request once it started arriving
+        timeout = KEEP_ALIVE_TIMEOUT_SECONDS
+        # Answer a body larger than one segment at once instead of waiting for the client's ACK
+        disable_nagle_algorithm = True
+
+        def setup(self):
+            super().setup()
+            # Request bodies are read into this buffer, reused by every request of the connection
+            self.body_buffer = bytearray(BODY_BUFFER_BYTES)
 
         def log_message(self, format, *args):
             pass
 
+        def send(self, status: int, headers: dict, body: bytes):
+            """
+            Writes the status line, the headers and the body as a single buffer.
+
+            Args:
+                status (int): The status code.
+                headers (dict): The response headers, Content-Length is added.
+                body (bytes): The response body.
+            """
+            lines = [f'{self.protocol_version} {status} {self.responses.get(status, ("",))[0]}',
+                     f'Server: {self.version_string()}',
+                     f'Date: {self.date_time_string()}']
+            for name, value in headers.items():
+                lines.append(f'{name}: {value}')
+            lines.append(f'Content-Length: {len(body)}')
+            if self.protocol_version == 'HTTP/1.1':
+                if self.close_connection:
+                    lines.append('Connection: close')
+                elif self.request_version == 'HTTP/1.0':
+                    lines.append('Connection: keep-alive')
+            head = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+            send_buffers(self.connection, [head, body])
+
+        def read_body(self) -> str:
+            """
+            Reads the request body into the connection's buffer and decodes it.
+
+            Returns:
+                str: The request body, None if it can't be read and the response has been sent.
+            """
+            if 'chunked' in self.headers.get('Transfer-Encoding', '').lower():
+                self.close_connection = True
+                self.send(411, {'Content-Type': 'text/plain'}, b'Length Required')
+                return None
+            try:
+                length = int(self.headers.get('Content-Length') or 0)
+                if length < 0:
+                    raise ValueError(length)
+            except ValueError:
+                self.close_connection = True
+                self.send(400, {'Content-Type': 'text/plain'}, b'Bad Content-Length')
+                return None
+            if length > len(self.body_buffer):
+                # Only grow the kept buffer up to a limit, larger bodies get one of their own
+                buffer = bytearray(length)
+                if length <= BODY_BUFFER_MAX_BYTES:
+                    self.body_buffer = buffer
+            else:
+                buffer = self.body_buffer
+            view = memoryview(buffer)[:length]
+            read = 0
+            while read < length:
+                n = self.rfile.readinto(view[read:])
+                if not n:
+                    # The client closed the connection mid-body
+                    self.close_connection = True
+                    return None
+                read += n
+            return str(view, 'utf-8')
+
         def do_POST(self):
             """
             Handles HTTP POST requests.
@@ -62,14 +511,12 @@ def run(name: str, host: str = '', port: int = 3000, root=None, logFormat='norma
             """
             parsed_url = urllib.parse.urlparse(self.path)
             url = parsed_url.path
+            request_body = self.read_body()
+            if request_body is None:
+                return
             if url == '/manifest.json':
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(runtime.manifest().encode('utf-8'))
+                self.send(200, {'Content-Type': 'application/json'}, app.manifest_content.encode('utf-8'))
                 return
-            content_length = int(self.headers['Content-Length'])
-            request_body = self.rfile.read(content_length).decode('utf-8')
             invoke_request = runtime.InvokeRequest(version=1,
                                                    protocol='HTTP',
                                                    method='POST',
@@ -78,16 +525,8 @@ def run(name: str, host: str = '', port: int = 3000, root=None, logFormat='norma
                                                    body=request_body,
                                                    is_base64_encoded=False)
             invoke_response = app.entry_handler(invoke_request)
-            # Send response status code
-            self.send_response(invoke_response.status_code)
-
-            # Set response headers
-            header = invoke_response.headers
-            if header is not None:
-                for header, value in header.items():
-                    self.send_header(header, value)
-                self.end_headers()
-            self.wfile.write(invoke_response.body.encode('utf-8'))
+            self.send(invoke_response.status_code, invoke_response.headers or {},
+                      invoke_response.body.encode('utf-8'))
 
         def do_GET(self):
             """
@@ -99,19 +538,22 @@ def run(name: str, host: str = '', port: int = 3000, root=None, logFormat='norma
             parsed_url = urllib.parse.urlparse(self.path)
             uri = parsed_url.path
             if uri == '/manifest.json':
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(app.manifest_content.encode('utf-8'))
-                return
+                self.send(200, {'Content-Type': 'application/json'}, app.manifest_content.encode('utf-8'))
+            elif uri == runtime.PATH_METRICS:
+                self.send(200, {'Content-Type': runtime.CONTENT_TYPE_METRICS}, app.metrics().encode('utf-8'))
             else:
-                self.send_response(404)
-                self.send_header('Content-Type', 'text/plain')
-                self.end_headers()
-                self.wfile.write(b'Not found')
-                return
+                self.send(404, {'Content-Type': 'text/plain'}, b'Not found')
 
-    httpd = HTTPServer((host, port), ProxyRequestHandler)
+    if threads is not None and threads > 0:
+        # A single-threaded server would wait on a kept-alive connection, only the pool parks them
+        ProxyRequestHandler.protocol_version = 'HTTP/1.1'
+        httpd = PooledHTTPServer((host, port), ProxyRequestHandler, threads, queue_size)
+    else:
+        httpd = HTTPServer((host, port), ProxyRequestHandler)
+    if workers is not None and workers > 0:
+        print(f'Server listening on {host}:{port}')
+        serve_prefork(httpd, workers)
+        return
     try:
         # 启动HTTP服务器
         with httpd:
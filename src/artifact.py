@@ -0,0 +1,176 @@
+import argparse
+import json
+import os
+
+import numpy as np
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+ARTIFACT_PATH = os.path.join(SRC_DIR, 'model.npy')
+
+FORMAT_NAME = 'sentiment-artifact'
+FORMAT_VERSION = 1
+# Every array starts on a cache line, so views on the mapped file stay aligned
+ALIGNMENT = 64
+# Little-endian uint64 holding the length of the JSON header
+HEADER_SIZE_BYTES = 8
+
+# TfidfVectorizer settings the exported tokenizer reproduces
+SUPPORTED_VECTORIZER_PARAMS = {
+    'analyzer': 'word',
+    'ngram_range': (1, 1),
+    'preprocessor': None,
+    'tokenizer': None,
+    'stop_words': None,
+    'strip_accents': None,
+    'binary': False,
+    'sublinear_tf': False,
+}
+
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+class SentimentArtifact:
+    """
+    A trained LogisticRegression and its TfidfVectorizer, stored as one pickle-free file.
+
+    The file is a single ``.npy`` byte array: a JSON header followed by the
+    coefficients, intercept, classes, IDF weights and a sorted vocabulary
+    table. Loaded with ``mmap_mode='r'``, every array is a read-only view on
+    the page cache, so loading is near instant and all processes that open
+    the same file share one copy in memory.
+
+    Attributes:
+        coef (np.ndarray): The model coefficients, shape (n_classes or 1, n_features).
+        intercept (np.ndarray): The model intercept.
+        classes (np.ndarray): The model classes.
+        idf (np.ndarray): The IDF weight of every feature column.
+        terms (np.ndarray): The vocabulary terms, sorted.
+        columns (np.ndarray): The feature column of each entry of ``terms``.
+        vectorizer (dict): The tokenizer and weighting settings.
+    """
+
+    def __init__(self, raw):
+        header_size = int(raw[:HEADER_SIZE_BYTES].view('<u8')[0])
+        header = json.loads(bytes(raw[HEADER_SIZE_BYTES:HEADER_SIZE_BYTES + header_size]))
+        if header.get('format') != FORMAT_NAME or header.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported artifact format {header.get('format')} v{header.get('version')}")
+
+        base = _align(HEADER_SIZE_BYTES + header_size)
+        for name, spec in header['arrays'].items():
+            dtype = np.dtype(spec['dtype'])
+            start = base + spec['offset']
+            size = int(np.prod(spec['shape'], dtype=np.int64)) * dtype.itemsize
+            setattr(self, name, raw[start:start + size].view(dtype).reshape(spec['shape']))
+        self.vectorizer = header['vectorizer']
+
+    @classmethod
+    def load(cls, path=ARTIFACT_PATH, mmap_mode='r'):
+        """
+        Open an artifact, memory-mapped read-only by default.
+        """
+        return cls(np.load(path, mmap_mode=mmap_mode))
+
+    def lookup(self, tokens):
+        """
+        Map tokens to feature columns with a binary search of the sorted vocabulary.
+
+        Args:
+            tokens (list): The tokens to look up.
+
+        Returns:
+            np.ndarray: The column of every token, -1 for tokens not in the vocabulary.
+        """
+        if len(self.terms) == 0 or len(tokens) == 0:
+            return np.full(len(tokens), -1, dtype=np.int64)
+        # Tokens longer than every term cannot match and would widen the whole array to their length
+        max_length = self.terms.dtype.itemsize // 4
+        if max(map(len, tokens)) > max_length:
+            kept = [i for i, token in enumerate(tokens) if len(token) <= max_length]
+            columns = np.full(len(tokens), -1, dtype=np.int64)
+            columns[kept] = self.lookup([tokens[i] for i in kept])
+            return columns
+        tokens = np.asarray(tokens, dtype=self.terms.dtype)
+        positions = np.minimum(np.searchsorted(self.terms, tokens), len(self.terms) - 1)
+        found = self.terms[positions] == tokens
+        return np.where(found, self.columns[positions], -1)
+
+
+def export_artifact(model, vectorizer, path=ARTIFACT_PATH):
+    """
+    Write a fitted LogisticRegression and TfidfVectorizer to a single artifact file.
+
+    Args:
+        model (LogisticRegression): The trained model.
+        vectorizer (TfidfVectorizer): The fitted vectorizer.
+        path (str): Where to write the artifact.
+    """
+    params = vectorizer.get_params()
+    for key, expected in SUPPORTED_VECTORIZER_PARAMS.items():
+        if params.get(key) != expected:
+            raise ValueError(f'Unsupported vectorizer setting {key}={params.get(key)!r}, expected {expected!r}')
+
+    vocabulary = sorted(vectorizer.vocabulary_.items())
+    classes = np.asarray(model.classes_)
+    if classes.dtype == object:
+        classes = classes.astype(str)
+    arrays = {
+        'coef': np.asarray(model.coef_, dtype=np.float64),
+        'intercept': np.asarray(model.intercept_, dtype=np.float64),
+        'classes': classes,
+        'idf': np.asarray(vectorizer.idf_, dtype=np.float64) if params['use_idf']
+        else np.ones(len(vocabulary), dtype=np.float64),
+        'terms': np.array([term for term, _ in vocabulary], dtype=str),
+        'columns': np.array([column for _, column in vocabulary], dtype=np.int64),
+    }
+
+    layout = {}
+    offset = 0
+    for name, array in arrays.items():
+        layout[name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset}
+        offset = _align(offset + array.nbytes)
+    header = json.dumps({
+        'format': FORMAT_NAME,
+        'version': FORMAT_VERSION,
+        'vectorizer': {
+            'lowercase': params['lowercase'],
+            'token_pattern': params['token_pattern'],
+            'norm': params['norm'],
+        },
+        'arrays': layout,
+    }).encode('utf-8')
+
+    base = _align(HEADER_SIZE_BYTES + len(header))
+    blob = np.zeros(base + offset, dtype=np.uint8)
+    blob[:HEADER_SIZE_BYTES] = np.frombuffer(np.array([len(header)], dtype='<u8').tobytes(), dtype=np.uint8)
+    blob[HEADER_SIZE_BYTES:HEADER_SIZE_BYTES + len(header)] = np.frombuffer(header, dtype=np.uint8)
+    for name, array in arrays.items():
+        start = base + layout[name]['offset']
+        blob[start:start + array.nbytes] = np.ascontiguousarray(array).reshape(-1).view(np.uint8)
+
+    # Replace the file rather than rewrite it, a server may have the previous version mapped
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    with open(temp_path, 'wb') as file:
+        np.save(file, blob)
+    os.replace(temp_path, path)
+
+
+def convert(model_path, vectorizer_path, output_path=ARTIFACT_PATH):
+    """
+    Convert the pickled ``model.pkl`` and ``vectorizer.pkl`` into one artifact file.
+    """
+    import joblib
+
+    export_artifact(joblib.load(model_path), joblib.load(vectorizer_path), output_path)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Convert model.pkl and vectorizer.pkl into a memory-mappable artifact.')
+    parser.add_argument('--model', default=os.path.join(SRC_DIR, 'model.pkl'), help='The pickled model.')
+    parser.add_argument('--vectorizer', default=os.path.join(SRC_DIR, 'vectorizer.pkl'), help='The pickled vectorizer.')
+    parser.add_argument('--output', default=ARTIFACT_PATH, help='Where to write the artifact.')
+    args = parser.parse_args()
+
+    convert(args.model, args.vectorizer, args.output)
+    print(f'Saved {args.output} ({os.path.getsize(args.output)} bytes)')
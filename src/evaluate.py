@@ -1,9 +1,11 @@
 import seaborn as sns
 import matplotlib.pyplot as plt
 import pandas as pd
-from preprocess import df  # Ensure df is correctly imported from preprocess.py
+from preprocess import load_dataset, clean
 from wordcloud import WordCloud
 
+df = clean(load_dataset())
+
 # Enable interactive mode
 plt.ion()
 
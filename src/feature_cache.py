@@ -0,0 +1,177 @@
+import hashlib
+import os
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+FEATURE_CACHE_PATH = os.path.join(SRC_DIR, '..', 'data', 'features.sqlite')
+
+# Host parameters per SELECT ... IN (...), under SQLite's default limit
+LOOKUP_BATCH_SIZE = 900
+
+# Raw values that are not strings all clean to '', so they share one key
+NON_TEXT_KEY = hashlib.blake2b(b'\x00non-text', digest_size=16).digest()
+
+
+def text_hash(value):
+    """
+    The cache key of a raw review text, a 128-bit BLAKE2b digest.
+    """
+    if not isinstance(value, str):
+        return NON_TEXT_KEY
+    return hashlib.blake2b(value.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+
+def vectorizer_fingerprint(vectorizer_path, cleaner):
+    """
+    Identify everything a cached row depends on.
+
+    The fitted vectorizer file, the cleaner's stopwords and its punctuation
+    pattern are hashed together, so replacing ``vectorizer.pkl`` or the
+    stopword list gives a new fingerprint.
+
+    Args:
+        vectorizer_path (str): The fitted vectorizer file.
+        cleaner (TextCleaner): The cleaner the cached texts went through.
+
+    Returns:
+        bytes: The SHA-256 digest.
+    """
+    digest = hashlib.sha256()
+    with open(vectorizer_path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    digest.update(b'\x00' + cleaner.punctuation_pattern.pattern.encode('utf-8'))
+    digest.update(b'\x00' + '\n'.join(sorted(cleaner.stop_words)).encode('utf-8'))
+    return digest.digest()
+
+
+def row_bytes(X, i):
+    """
+    The column indices of a CSR row as int32 bytes and its values as float64 bytes.
+    """
+    start, end = X.indptr[i], X.indptr[i + 1]
+    return (X.indices[start:end].astype(np.int32, copy=False).tobytes(),
+            X.data[start:end].astype(np.float64, copy=False).tobytes())
+
+
+class FeatureCache:
+    """
+    On-disk cache of cleaned review texts and their TF-IDF rows.
+
+    Rows are keyed by the hash of the raw text and the fingerprint of the
+    vectorizer and cleaner that produced them, so scoring runs over mostly
+    unchanged data only clean and vectorize the new or changed texts. Each
+    row stores the cleaned text and the column indices and values of its
+    sparse row, exactly as the vectorizer returned them. Rows of any other
+    fingerprint are deleted when the cache is opened with a new one.
+
+    The cache is a SQLite database in WAL mode, so worker processes can
+    each open it and read while another writes.
+    """
+
+    def __init__(self, path, fingerprint, n_features):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.n_features = n_features
+        self.connection = sqlite3.connect(path, timeout=60)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        with self.connection:
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS features ('
+                'text_hash BLOB NOT NULL, fingerprint BLOB NOT NULL, cleaned TEXT NOT NULL, '
+                'indices BLOB NOT NULL, data BLOB NOT NULL, '
+                'PRIMARY KEY (text_hash, fingerprint)) WITHOUT ROWID')
+            self.connection.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value BLOB)')
+        self._prune()
+
+    def _prune(self):
+        with self.connection:
+            row = self.connection.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+            if row is not None and row[0] == self.fingerprint:
+                return
+            self.connection.execute('DELETE FROM features WHERE fingerprint != ?', (self.fingerprint,))
+            self.connection.execute("INSERT OR REPLACE INTO meta VALUES ('fingerprint', ?)", (self.fingerprint,))
+
+    def lookup(self, keys):
+        """
+        Fetch the cached rows of some texts.
+
+        Args:
+            keys (list): Text hashes.
+
+        Returns:
+            dict: ``(cleaned, indices, data)`` by text hash for the texts in the cache, with
+            ``indices`` the raw int32 and ``data`` the raw float64 bytes of their row.
+        """
+        found = {}
+        for start in range(0, len(keys), LOOKUP_BATCH_SIZE):
+            batch = keys[start:start + LOOKUP_BATCH_SIZE]
+            query = ('SELECT text_hash, cleaned, indices, data FROM features '
+                     f'WHERE fingerprint = ? AND text_hash IN ({",".join("?" * len(batch))})')
+            for key, cleaned, indices, data in self.connection.execute(query, [self.fingerprint] + batch):
+                found[key] = (cleaned, indices, data)
+        return found
+
+    def store(self, keys, cleaned, X):
+        """
+        Cache the cleaned texts and rows of some texts.
+
+        Args:
+            keys (list): Text hashes.
+            cleaned (list): The cleaned texts, aligned with ``keys``.
+            X (scipy.sparse.csr_matrix): The vectorized rows, aligned with ``keys``.
+
+        Returns:
+            list: The stored ``(text_hash, fingerprint, cleaned, indices, data)`` rows.
+        """
+        rows = [(key, self.fingerprint, text) + row_bytes(X, i) for i, (key, text) in enumerate(zip(keys, cleaned))]
+        with self.connection:
+            self.connection.executemany('INSERT OR REPLACE INTO features VALUES (?, ?, ?, ?, ?)', rows)
+        return rows
+
+    def transform(self, texts, cleaner, vectorizer):
+        """
+        Clean and vectorize review texts, only computing those not in the cache.
+
+        The result is the same as ``cleaner.clean_series`` followed by
+        ``vectorizer.transform`` on every text.
+
+        Args:
+            texts (pd.Series): The raw review texts.
+            cleaner (TextCleaner): The cleaner to run on new texts.
+            vectorizer: The fitted vectorizer to run on new texts.
+
+        Returns:
+            tuple: The cleaned texts as a Series aligned with ``texts``, and their rows as a CSR matrix.
+        """
+        values = texts.tolist()
+        keys = [text_hash(value) for value in values]
+        unique = list(dict.fromkeys(keys))
+        rows = self.lookup(unique)
+
+        missing = [key for key in unique if key not in rows]
+        if missing:
+            first = dict(zip(reversed(keys), reversed(values)))
+            new_values = [first[key] for key in missing]
+            new_cleaned = cleaner.clean_batch(new_values)
+            X_new = vectorizer.transform(new_cleaned).tocsr()
+            for key, _, cleaned, indices, data in self.store(missing, new_cleaned, X_new):
+                rows[key] = (cleaned, indices, data)
+
+        # Join the raw rows and decode them once, rather than an array per row
+        ordered = [rows[key] for key in keys]
+        indptr = np.zeros(len(ordered) + 1, dtype=np.int64)
+        np.cumsum([len(row[1]) // 4 for row in ordered], out=indptr[1:])
+        indices = np.frombuffer(b''.join([row[1] for row in ordered]), dtype=np.int32)
+        data = np.frombuffer(b''.join([row[2] for row in ordered]), dtype=np.float64)
+        X = sp.csr_matrix((data, indices, indptr), shape=(len(ordered), self.n_features))
+        cleaned = pd.Series([row[0] for row in ordered], index=texts.index, name=texts.name, dtype=object)
+        return cleaned, X
+
+    def close(self):
+        self.connection.close()
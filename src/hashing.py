@@ -0,0 +1,46 @@
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+
+class HashingTfidfVectorizer:
+    """
+    Stateless TF-IDF features: a hashing vectorizer plus a precomputed IDF array.
+
+    Tokens are hashed straight to a column, so there is no vocabulary to
+    build, pickle or look up. The only fitted state is the IDF weight of
+    every column, saved as a single NumPy array that loads in milliseconds
+    and can be shared by any number of processes.
+    """
+
+    def __init__(self, n_features=2 ** 18, idf=None):
+        self.n_features = n_features
+        self.idf = idf
+        # Raw term counts, weighted and normalized the same way as TfidfVectorizer
+        self.hasher = HashingVectorizer(n_features=n_features, alternate_sign=False, norm=None)
+
+    def fit(self, docs):
+        counts = self.hasher.transform(docs)
+        n_samples = counts.shape[0]
+        doc_freq = np.bincount(counts.indices, minlength=self.n_features)
+        # Smoothed IDF, as TfidfVectorizer(smooth_idf=True)
+        self.idf = (np.log((1 + n_samples) / (1 + doc_freq)) + 1).astype(np.float32)
+        return self
+
+    def transform(self, docs):
+        if self.idf is None:
+            raise ValueError('HashingTfidfVectorizer is not fitted yet, call fit() or load() first.')
+        X = self.hasher.transform(docs)
+        X.data *= self.idf[X.indices]
+        return normalize(X, copy=False)
+
+    def fit_transform(self, docs):
+        return self.fit(docs).transform(docs)
+
+    def save(self, path):
+        np.save(path, self.idf)
+
+    @classmethod
+    def load(cls, path, mmap_mode=None):
+        idf = np.load(path, mmap_mode=mmap_mode)
+        return cls(n_features=len(idf), idf=idf)
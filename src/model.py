@@ -8,7 +8,17 @@ from sklearn.metrics import classification_report, confusion_matrix
 import matplotlib.pyplot as plt
 import seaborn as sns
 import joblib
-from preprocess import df
+import argparse
+from preprocess import load_dataset, clean
+from hashing import HashingTfidfVectorizer
+from artifact import export_artifact
+
+parser = argparse.ArgumentParser(description='Train the review sentiment model.')
+parser.add_argument('--features', choices=['tfidf', 'hashing'], default='tfidf',
+                    help='tfidf fits a vocabulary into vectorizer.pkl, hashing saves only IDF weights to hashing_idf.npy.')
+args = parser.parse_args()
+
+df = clean(load_dataset())
 
 # Drop rows with NaN values in the 'sentiment' column
 df = df.dropna(subset=['sentiment'])
@@ -65,12 +75,18 @@ else:
     print(y_train.value_counts())
 
     # Vectorizing text
-    vectorizer = TfidfVectorizer(max_features=5000)
+    if args.features == 'hashing':
+        vectorizer = HashingTfidfVectorizer()
+    else:
+        vectorizer = TfidfVectorizer(max_features=5000)
     X_train_vec = vectorizer.fit_transform(X_train)
     X_test_vec = vectorizer.transform(X_test)
 
     # Saving the vectorizer
-    joblib.dump(vectorizer, 'vectorizer.pkl')
+    if args.features == 'hashing':
+        vectorizer.save('hashing_idf.npy')
+    else:
+        joblib.dump(vectorizer, 'vectorizer.pkl')
 
     # Training the model
     model = LogisticRegression()
@@ -89,4 +105,9 @@ else:
     plt.show()
 
     # Saving the model
-    joblib.dump(model, 'model.pkl')
+    if args.features == 'hashing':
+        joblib.dump(model, 'model_hashing.pkl')
+    else:
+        joblib.dump(model, 'model.pkl')
+        # Memory-mappable copy of the model and vectorizer for serving
+        export_artifact(model, vectorizer, 'model.npy')
@@ -1,21 +1,25 @@
-import pandas as pd
-import joblib
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
-from preprocess import df
+import argparse
 
-# Load the trained model
-model = joblib.load('model.pkl')
+from preprocess import DATA_PATH
+from feature_cache import FEATURE_CACHE_PATH
+from scoring import MODEL_PATH, PREDICTIONS_PATH, VECTORIZER_PATH, score_csv
 
-# Load the vectorizer
-vectorizer = joblib.load('vectorizer.pkl')
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Score the reviews dataset with the trained model.')
+    parser.add_argument('--input', default=DATA_PATH, help='The reviews CSV to score.')
+    parser.add_argument('--output', default=PREDICTIONS_PATH, help='Where to save the predictions.')
+    parser.add_argument('--model', default=MODEL_PATH, help='The trained model.')
+    parser.add_argument('--vectorizer', default=VECTORIZER_PATH,
+                        help='vectorizer.pkl, or hashing_idf.npy for the hashing features.')
+    parser.add_argument('--chunksize', type=int, default=10000, help='Rows scored per chunk.')
+    parser.add_argument('--workers', type=int, default=None, help='Score chunks on this many processes.')
+    parser.add_argument('--feature-cache', nargs='?', const=FEATURE_CACHE_PATH, default=None,
+                        help='Reuse cleaned reviews and features from earlier runs, '
+                             f'cached in this SQLite file (default {FEATURE_CACHE_PATH}).')
+    args = parser.parse_args()
 
-# Vectorize the text data using the loaded vectorizer
-X = vectorizer.transform(df['cleaned_review'])
-
-# Predict using the loaded model
-predictions = model.predict(X)
-df['predictions'] = predictions
-
-# Save predictions to a file
-df.to_csv('../data/predicted_steam_data.csv', index=False)
\ No newline at end of file
+    # Load, vectorize and predict chunk by chunk, appending to the output file
+    stats = score_csv(args.input, args.output, chunksize=args.chunksize, workers=args.workers,
+                      model_path=args.model, vectorizer_path=args.vectorizer,
+                      feature_cache_path=args.feature_cache)
+    print(f"Scored {stats['rows']} rows in {stats['seconds']:.2f}s ({stats['rows_per_sec']:.0f} rows/sec)")
@@ -0,0 +1,86 @@
+import re
+
+import numpy as np
+from scipy import sparse
+from scipy.special import expit
+
+from artifact import ARTIFACT_PATH, SentimentArtifact
+
+
+class Predictor:
+    """
+    Scores cleaned reviews from a ``SentimentArtifact`` without scikit-learn.
+
+    Serving a binary LogisticRegression over TF-IDF only needs tokenize,
+    a sparse dot product with the coefficients and a sigmoid. Every step
+    repeats the floating point operations of TfidfVectorizer.transform and
+    LogisticRegression in the same order, so predictions and probabilities
+    are bit-for-bit identical to the scikit-learn pipeline.
+    """
+
+    def __init__(self, artifact):
+        if artifact.coef.shape[0] != 1:
+            raise ValueError(f'Only binary models are supported, got {len(artifact.classes)} classes')
+        self.artifact = artifact
+        self.lowercase = artifact.vectorizer['lowercase']
+        self.token_pattern = re.compile(artifact.vectorizer['token_pattern'])
+        self.norm = artifact.vectorizer['norm']
+        self.n_features = artifact.idf.shape[0]
+
+    @classmethod
+    def load(cls, path=ARTIFACT_PATH):
+        return cls(SentimentArtifact.load(path))
+
+    def transform(self, docs):
+        """
+        TF-IDF features of a batch of documents, as ``vectorizer.transform`` would return.
+
+        Args:
+            docs (list): The cleaned review texts.
+
+        Returns:
+            sparse.csr_matrix: The L2-normalized TF-IDF matrix.
+        """
+        tokens = []
+        lengths = []
+        for doc in docs:
+            if self.lowercase:
+                doc = doc.lower()
+            found = self.token_pattern.findall(doc)
+            tokens.extend(found)
+            lengths.append(len(found))
+
+        n_docs = len(lengths)
+        columns = self.artifact.lookup(tokens)
+        rows = np.repeat(np.arange(n_docs, dtype=np.int64), lengths)
+        known = columns >= 0
+        # One key per (row, column) pair, sorted by row then column like CountVectorizer output
+        keys, counts = np.unique(rows[known] * self.n_features + columns[known], return_counts=True)
+        rows, columns = np.divmod(keys, self.n_features)
+
+        indptr = np.zeros(n_docs + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n_docs), out=indptr[1:])
+        data = counts.astype(np.float64)
+        data *= self.artifact.idf[columns]
+
+        if self.norm == 'l2':
+            # Row sums of squares accumulated left to right, as sklearn's normalize does
+            squares = sparse.csr_matrix((data * data, columns, indptr), shape=(n_docs, self.n_features))
+            norms = np.sqrt(squares @ np.ones(self.n_features))
+            norms[norms == 0] = 1.0
+            data /= np.repeat(norms, np.diff(indptr))
+        elif self.norm is not None:
+            raise ValueError(f'Unsupported norm {self.norm!r}')
+        return sparse.csr_matrix((data, columns, indptr), shape=(n_docs, self.n_features))
+
+    def decision_function(self, docs):
+        X = self.transform(docs)
+        scores = X @ self.artifact.coef.T + self.artifact.intercept.reshape(1, -1)
+        return scores.reshape(-1)
+
+    def predict(self, docs):
+        return self.artifact.classes[(self.decision_function(docs) > 0).astype(int)]
+
+    def predict_proba(self, docs):
+        prob = expit(self.decision_function(docs))
+        return np.vstack([1 - prob, prob]).T
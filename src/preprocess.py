@@ -1,30 +1,14 @@
-import pandas as pd
-import numpy as np
-import re
-from sklearn.model_selection import train_test_split
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
-from sklearn.metrics import classification_report, confusion_matrix
-import matplotlib.pyplot as plt
-import seaborn as sns
-
 import os
-import nltk
-from nltk.corpus import stopwords
-nltk.download('stopwords')
-
-# Load dataset
-file_path = r'../data/steam_data.csv'
-if not os.path.exists(file_path):
-    raise FileNotFoundError(f"The file {file_path} does not exist.")
-df = pd.read_csv(file_path)
+import re
+import sys
+from functools import lru_cache
+from itertools import chain
 
-# Check if 'recentReviews' column exists
-if 'recentReviews' not in df.columns:
-    raise KeyError("The 'recentReviews' column is missing from the dataset.")
+# Default dataset location, independent of the working directory
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'steam_data.csv')
 
 # Map review sentiments to numerical values
-sentiment_mapping = {
+SENTIMENT_MAPPING = {
     'Overwhelmingly Positive': 2,
     'Very Positive': 2,
     'Positive': 1,
@@ -35,29 +19,191 @@ sentiment_mapping = {
     'Very Negative': -2,
     'Overwhelmingly Negative': -2
 }
-df['sentiment'] = df['recentReviews'].map(sentiment_mapping)
+
+
+def _nltk_data_dirs():
+    # Same lookup order as nltk.data.path, without importing nltk
+    dirs = [path for path in os.environ.get('NLTK_DATA', '').split(os.pathsep) if path]
+    dirs.append(os.path.expanduser('~/nltk_data'))
+    for prefix in (sys.prefix, sys.exec_prefix):
+        dirs.append(os.path.join(prefix, 'nltk_data'))
+        dirs.append(os.path.join(prefix, 'share', 'nltk_data'))
+        dirs.append(os.path.join(prefix, 'lib', 'nltk_data'))
+    dirs += ['/usr/share/nltk_data', '/usr/local/share/nltk_data',
+             '/usr/lib/nltk_data', '/usr/local/lib/nltk_data']
+    return dirs
+
+
+@lru_cache(maxsize=None)
+def load_stopwords(language='english'):
+    """
+    Load the NLTK stopword list from the local data cache.
+
+    Nothing is downloaded: run ``python -m nltk.downloader stopwords`` once
+    to populate the cache. The plain corpus file is read directly when it
+    exists, nltk itself is only imported for zipped installs.
+
+    Args:
+        language (str): The stopword list to load.
+
+    Returns:
+        frozenset: The stopwords.
+    """
+    for data_dir in _nltk_data_dirs():
+        path = os.path.join(data_dir, 'corpora', 'stopwords', language)
+        if os.path.isfile(path):
+            with open(path, encoding='utf-8') as file:
+                return frozenset(line for line in file.read().splitlines() if line.strip())
+
+    from nltk.corpus import stopwords
+    try:
+        return frozenset(stopwords.words(language))
+    except LookupError as e:
+        raise LookupError(
+            f"NLTK stopwords for '{language}' are not in the local cache, "
+            "run `python -m nltk.downloader stopwords` to install them.") from e
+
+
+def load_dataset(path=DATA_PATH, columns=None, nrows=None):
+    """
+    Load the raw Steam reviews dataset.
+
+    Args:
+        path (str): The CSV file to read.
+        columns (list, optional): Only read these columns.
+        nrows (int, optional): Only read this many rows.
+
+    Returns:
+        pd.DataFrame: The raw dataset.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"The file {path} does not exist.")
+    import pandas as pd
+
+    df = pd.read_csv(path, usecols=columns, nrows=nrows)
+
+    # Check if 'recentReviews' column exists
+    if 'recentReviews' not in df.columns:
+        raise KeyError("The 'recentReviews' column is missing from the dataset.")
+    return df
+
 
 # Cleaning text data
+class TextCleaner:
+    """
+    Reusable review text cleaner.
+
+    The stopword set and the punctuation pattern are built once per cleaner
+    instead of once per row. Whole Series are cleaned in chunks: each chunk
+    is joined into a single string so the regex substitution and lowercasing
+    run once per chunk rather than once per review. The output is identical
+    to cleaning every value on its own.
+    """
+    punctuation_pattern = re.compile(r'[^\w\s]')
+    # Whitespace to both str.split() and the pattern above, so it survives
+    # cleaning and never merges two reviews into one token.
+    separator = '\x1e'
+
+    def __init__(self, stop_words=None):
+        if stop_words is None:
+            stop_words = load_stopwords()
+        self.stop_words = frozenset(stop_words)
+
+    def clean(self, text):
+        if not isinstance(text, str):
+            return ''
+        text = self.punctuation_pattern.sub('', text).lower()
+        return self._drop_stop_words(text)
+
+    def clean_series(self, series, chunksize=10000, workers=None):
+        """
+        Clean every value of a pandas Series.
+
+        Args:
+            series (pd.Series): The raw review texts.
+            chunksize (int): Number of reviews cleaned per batch.
+            workers (int, optional): Clean chunks on a process pool of this size.
+
+        Returns:
+            pd.Series: The cleaned texts, aligned with ``series``.
+        """
+        import pandas as pd
+
+        values = series.tolist()
+        chunks = [values[i:i + chunksize] for i in range(0, len(values), chunksize)]
+        if workers is not None and workers > 1 and len(chunks) > 1:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                cleaned = list(executor.map(self.clean_batch, chunks))
+        else:
+            cleaned = [self.clean_batch(chunk) for chunk in chunks]
+        return pd.Series(list(chain.from_iterable(cleaned)),
+                         index=series.index, name=series.name, dtype=object)
+
+    def clean_batch(self, values):
+        """
+        Clean a list of values with one regex pass over the whole batch.
+        """
+        positions = [i for i, value in enumerate(values) if isinstance(value, str)]
+        texts = [values[i] for i in positions]
+        joined = self.separator.join(texts)
+        rows = self.punctuation_pattern.sub('', joined).lower().split(self.separator)
+        if len(rows) != len(texts):
+            # A review contains the separator itself, clean row by row
+            rows = [self.punctuation_pattern.sub('', text).lower() for text in texts]
+
+        cleaned = [''] * len(values)
+        for i, row in zip(positions, rows):
+            cleaned[i] = self._drop_stop_words(row)
+        return cleaned
+
+    def _drop_stop_words(self, text):
+        stop_words = self.stop_words
+        return ' '.join([word for word in text.split() if word not in stop_words])
+
+
+_default_cleaner = None
+
+
 def clean_text(text):
-    if not isinstance(text, str):
-        return ''
-    text = re.sub(r'[^\w\s]', '', text)
-    text = text.lower()
-    stop_words = set(stopwords.words('english'))
-    text = ' '.join([word for word in text.split() if word not in stop_words])
-    return text
+    global _default_cleaner
+    if _default_cleaner is None:
+        _default_cleaner = TextCleaner()
+    return _default_cleaner.clean(text)
+
 
-df['cleaned_review'] = df['recentReviews'].apply(clean_text)
+def clean(df, cleaner=None, workers=None, cleaned=None):
+    """
+    Add the ``sentiment`` and ``cleaned_review`` columns to a raw dataset.
 
+    Args:
+        df (pd.DataFrame): The dataset returned by ``load_dataset``, updated in place.
+        cleaner (TextCleaner, optional): The cleaner to use.
+        workers (int, optional): Clean on a process pool of this size.
+        cleaned (pd.Series, optional): Reviews already cleaned, used instead of cleaning them again.
 
+    Returns:
+        pd.DataFrame: The same dataframe.
+    """
+    if cleaner is None:
+        cleaner = TextCleaner()
+    # Always float, so chunks without unmapped reviews still format as '2.0'
+    df['sentiment'] = df['recentReviews'].map(SENTIMENT_MAPPING).astype(float)
+    if cleaned is None:
+        cleaned = cleaner.clean_series(df['recentReviews'], workers=workers)
+    df['cleaned_review'] = cleaned
 
-df['description'] = df['description'].astype(str)
-df['sentiment'] = df['sentiment'].astype(str)
-# Check the shape of the dataframe
-# Check data types
-print(df['sentiment'].dtype)
+    if 'description' in df.columns:
+        df['description'] = df['description'].astype(str)
+    df['sentiment'] = df['sentiment'].astype(str)
+    return df
 
-# Check unique values in the sentiment column
-print(df['sentiment'].unique())
 
+if __name__ == '__main__':
+    df = clean(load_dataset())
+    # Check data types
+    print(df['sentiment'].dtype)
 
+    # Check unique values in the sentiment column
+    print(df['sentiment'].unique())
@@ -0,0 +1,144 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import joblib
+import pandas as pd
+
+from preprocess import TextCleaner, clean
+from feature_cache import FeatureCache, vectorizer_fingerprint
+from hashing import HashingTfidfVectorizer
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_PATH = os.path.join(SRC_DIR, 'model.pkl')
+VECTORIZER_PATH = os.path.join(SRC_DIR, 'vectorizer.pkl')
+PREDICTIONS_PATH = os.path.join(SRC_DIR, '..', 'data', 'predicted_steam_data.csv')
+
+
+def load_vectorizer(path):
+    """
+    Load a fitted vectorizer: ``.npy`` IDF weights for the hashing features,
+    a pickled TfidfVectorizer otherwise.
+    """
+    if path.endswith('.npy'):
+        return HashingTfidfVectorizer.load(path)
+    return joblib.load(path)
+
+
+class Scorer:
+    """
+    Cleans, vectorizes and predicts one chunk of reviews at a time.
+
+    The model, vectorizer and cleaner are loaded once and reused for every chunk.
+    With a ``feature_cache_path``, cleaned reviews and their feature rows are
+    kept in a ``FeatureCache`` there, so only new or changed reviews are
+    cleaned and vectorized.
+    """
+
+    def __init__(self, model_path=MODEL_PATH, vectorizer_path=VECTORIZER_PATH, cleaner=None,
+                 feature_cache_path=None):
+        self.model = joblib.load(model_path)
+        self.vectorizer = load_vectorizer(vectorizer_path)
+        self.cleaner = cleaner if cleaner is not None else TextCleaner()
+        self.feature_cache = None
+        if feature_cache_path is not None:
+            n_features = self.vectorizer.transform(['']).shape[1]
+            self.feature_cache = FeatureCache(feature_cache_path,
+                                              vectorizer_fingerprint(vectorizer_path, self.cleaner), n_features)
+
+    def score(self, df):
+        """
+        Add the ``predictions`` column to a chunk of the raw dataset.
+
+        Args:
+            df (pd.DataFrame): A chunk of the raw dataset, updated in place.
+
+        Returns:
+            pd.DataFrame: The same chunk.
+        """
+        if self.feature_cache is None:
+            clean(df, self.cleaner)
+            X = self.vectorizer.transform(df['cleaned_review'])
+        else:
+            cleaned, X = self.feature_cache.transform(df['recentReviews'], self.cleaner, self.vectorizer)
+            clean(df, self.cleaner, cleaned=cleaned)
+        df['predictions'] = self.model.predict(X)
+        return df
+
+
+# Per-process scorer, loaded once by _init_worker when the pool starts
+_worker_scorer = None
+
+
+def _init_worker(model_path, vectorizer_path, feature_cache_path):
+    global _worker_scorer
+    _worker_scorer = Scorer(model_path, vectorizer_path, feature_cache_path=feature_cache_path)
+
+
+def _score_in_worker(chunk):
+    return _worker_scorer.score(chunk)
+
+
+def _score_chunks(reader, workers, model_path, vectorizer_path, feature_cache_path=None):
+    """
+    Yield scored chunks in input order.
+
+    With ``workers`` set, chunks are scored on a process pool. At most two
+    chunks per worker are in flight, so memory stays bounded by the chunk
+    size while every worker is kept busy.
+    """
+    if workers is None or workers <= 1:
+        scorer = Scorer(model_path, vectorizer_path, feature_cache_path=feature_cache_path)
+        for chunk in reader:
+            yield scorer.score(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(model_path, vectorizer_path, feature_cache_path)) as executor:
+        pending = deque()
+        for chunk in reader:
+            pending.append(executor.submit(_score_in_worker, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def score_csv(input_path, output_path=PREDICTIONS_PATH, chunksize=10000, workers=None,
+              model_path=MODEL_PATH, vectorizer_path=VECTORIZER_PATH, verbose=True, feature_cache_path=None):
+    """
+    Score a CSV of reviews chunk by chunk and append predictions to ``output_path``.
+
+    Only a bounded number of chunks is held in memory at a time, so peak
+    memory depends on ``chunksize`` and not on the size of the input file.
+    The output is the same with and without ``workers``.
+
+    Args:
+        input_path (str): The raw reviews CSV.
+        output_path (str): Where to write the scored CSV, overwritten if it exists.
+        chunksize (int): Number of rows read, scored and written per chunk.
+        workers (int, optional): Score chunks on a process pool of this size.
+        model_path (str): The trained model.
+        vectorizer_path (str): The fitted vectorizer.
+        verbose (bool): Print progress after every chunk.
+        feature_cache_path (str, optional): Reuse the cleaned reviews and feature rows cached in
+            this SQLite file by earlier runs, adding the new ones. Entries made with another
+            vectorizer or stopword list are discarded.
+
+    Returns:
+        dict: The number of rows scored, elapsed seconds and rows per second.
+    """
+    start = time.perf_counter()
+    rows = 0
+    with pd.read_csv(input_path, chunksize=chunksize) as reader:
+        scored = _score_chunks(reader, workers, model_path, vectorizer_path, feature_cache_path)
+        for i, chunk in enumerate(scored):
+            chunk.to_csv(output_path, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+            rows += len(chunk)
+            if verbose:
+                elapsed = time.perf_counter() - start
+                print(f'scored {rows} rows, {rows / elapsed:.0f} rows/sec')
+
+    elapsed = time.perf_counter() - start
+    return {'rows': rows, 'seconds': elapsed, 'rows_per_sec': rows / elapsed if elapsed else 0.0}